@@ -0,0 +1,35 @@
+"""
+Exact cover solvers shared by the puzzle solvers in this repository.
+
+Every backend takes the 0/1 matrix (dense, scipy.sparse or COO indices) and offers the same
+search / solve / all_solutions / no_of_solutions interface:
+
+    linked -- DancingLinks, one Node object per nonzero entry
+    array  -- ArrayDancingLinks, links in flat int arrays (Knuth's DLX1 layout)
+    bitset -- BitsetExactCover, rows as int bit masks, for universes of up to a few hundred columns
+
+Matrices and placement tables are saved in a memory-mappable format by exact_cover.storage.
+"""
+from .base import ExactCover, to_coo, sort_coo
+from .linked import DancingLinks
+from .arrays import ArrayDancingLinks
+from .bitset import BitsetExactCover
+
+
+BACKENDS = {
+    'linked': DancingLinks,
+    'array': ArrayDancingLinks,
+    'bitset': BitsetExactCover,
+}
+
+
+def solver(matrix, backend='linked', **kwargs):
+    """
+    Builds the exact cover solver for matrix with the chosen backend.
+    """
+    try:
+        backend_class = BACKENDS[backend]
+    except KeyError:
+        raise ValueError(f'Unknown backend {backend!r}, expected one of {list(BACKENDS)}') from None
+
+    return backend_class(matrix, **kwargs)
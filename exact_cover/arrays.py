@@ -0,0 +1,478 @@
+from array import array
+import numpy as np
+
+from .base import ExactCover
+
+
+def int_array(values):
+    """
+    Packs a numpy array into an array('i') buffer.
+    """
+    out = array('i')
+    out.frombytes(np.ascontiguousarray(values, dtype=np.int32).tobytes())
+    return out
+
+
+
+class ArrayDancingLinks(ExactCover):
+    """
+    Dancing Links with all links stored in flat int arrays (in the style of Knuth's DLX1).
+
+    Index 0 is the root, indices 1..n are the column headers and the remaining indices are the
+    nodes of the options. Every option is preceded and followed by a spacer whose TOP is <= 0,
+    its ULINK points to the first node of the option before it and its DLINK to the last node of
+    the option after it.
+
+    The links are copied into plain lists once built. With compact=True they stay in array('i')
+    buffers (4 bytes per link), which takes about a third of the memory but searches 2-3x
+    slower in CPython, since reading from an array allocates a new int object every time. Either way
+    the search is slower than DancingLinks in CPython, this layout only builds faster and smaller.
+    """
+    def _link(self, rows, cols, n_cols, compact=False):
+        """
+        Wires every link with vectorized numpy operations over the nonzero entries in O(nnz).
+        """
+        nnz = len(rows)
+
+        # Option number of every node; nodes are laid out row by row with a spacer after every option
+        first_in_row = np.ones(nnz, dtype=bool)
+        first_in_row[1:] = rows[1:] != rows[:-1]
+        last_in_row = np.ones(nnz, dtype=bool)
+        last_in_row[:-1] = first_in_row[1:]
+
+        option = np.cumsum(first_in_row) - 1
+        n_options = int(first_in_row.sum())
+        node = n_cols + 2 + np.arange(nnz) + option
+        first_nodes, last_nodes = node[first_in_row], node[last_in_row]
+        spacers = np.concatenate(([n_cols + 1], last_nodes + 1))
+        size = n_cols + 2 + nnz + n_options
+
+        top = np.zeros(size, dtype=np.int64)
+        ulink = np.arange(size)
+        dlink = np.arange(size)
+        row = np.full(size, -1)
+
+        # Nodes point to their column, headers hold the column size
+        top[node] = cols + 1
+        top[1:n_cols + 1] = np.bincount(cols, minlength=n_cols)
+        row[node] = rows
+
+        # Spacers
+        top[spacers[1:]] = -rows[first_in_row] - 1
+        ulink[spacers[1:]] = first_nodes
+        dlink[spacers[:-1]] = last_nodes
+
+        # Every column is a cycle through its header and then its nodes from top to bottom
+        cycle = np.concatenate((np.arange(1, n_cols + 1), node))
+        cycle_col = np.concatenate((np.arange(n_cols), cols))
+        order = np.argsort(cycle_col, kind='stable')
+        cycle, cycle_col = cycle[order], cycle_col[order]
+
+        below = np.roll(cycle, -1)
+        last_in_col = np.ones(len(cycle), dtype=bool)
+        last_in_col[:-1] = cycle_col[1:] != cycle_col[:-1]
+        below[last_in_col] = np.arange(1, n_cols + 1)
+        dlink[cycle] = below
+        ulink[below] = cycle
+
+        # Horizontal links of the primary column headers (0 is the root), secondary ones link to themselves
+        llink, rlink = np.arange(n_cols + 1), np.arange(n_cols + 1)
+        active = np.concatenate(([0], np.flatnonzero(self.primary) + 1))
+        llink[active] = np.roll(active, 1)
+        rlink[active] = np.roll(active, -1)
+        self.llink, self.rlink = int_array(llink), int_array(rlink)
+
+        self.top, self.ulink, self.dlink = int_array(top), int_array(ulink), int_array(dlink)
+        self.row = int_array(row)
+
+        # First node of every row (-1 for empty rows), used to pre-cover rows
+        first_row_nodes = np.full(self.n_rows, -1)
+        first_row_nodes[rows[first_in_row]] = first_nodes
+        self.first_row_nodes = int_array(first_row_nodes)
+
+        if not compact:
+            self.llink, self.rlink = list(self.llink), list(self.rlink)
+            self.top, self.ulink, self.dlink = list(self.top), list(self.ulink), list(self.dlink)
+
+
+    def cover(self, column):
+        top, ulink, dlink = self.top, self.ulink, self.dlink
+
+        # Cover all options in this column (for this item)
+        updates = 1
+        p = dlink[column]
+        while p != column:
+
+            # Hide this option from every other column
+            q = p + 1
+            while q != p:
+                x = top[q]
+                if x <= 0:  # Spacer, go back to the start of this option
+                    q = ulink[q]
+                else:
+                    u, d = ulink[q], dlink[q]
+                    dlink[u] = d
+                    ulink[d] = u
+                    top[x] -= 1
+                    q += 1
+                    updates += 1
+
+            p = dlink[p]
+
+        # Cover the column header
+        l, r = self.llink[column], self.rlink[column]
+        self.rlink[l] = r
+        self.llink[r] = l
+
+        level = len(self.solution)
+        self.level_covers[level] += 1
+        self.level_updates[level] += updates
+
+
+    def uncover(self, column):
+        top, ulink, dlink = self.top, self.ulink, self.dlink
+
+        # Uncover the column header
+        l, r = self.llink[column], self.rlink[column]
+        self.rlink[l] = column
+        self.llink[r] = column
+
+        # Uncover all options in this column (for this item)
+        p = ulink[column]
+        while p != column:
+
+            # Unhide this option in reverse order
+            q = p - 1
+            while q != p:
+                x = top[q]
+                if x <= 0:  # Spacer, go forward to the end of this option
+                    q = dlink[q]
+                else:
+                    u, d = ulink[q], dlink[q]
+                    dlink[u] = q
+                    ulink[d] = q
+                    top[x] += 1
+                    q -= 1
+
+            p = ulink[p]
+
+
+    def cover_row(self, node):
+        # Cover all the other items / columns of the option containing node
+        self.level_nodes[len(self.solution)] += 1
+        top, ulink = self.top, self.ulink
+
+        p = node + 1
+        while p != node:
+            column = top[p]
+            if column <= 0:
+                p = ulink[p]
+            else:
+                self.cover(column)
+                p += 1
+
+
+    def uncover_row(self, node):
+        top, dlink = self.top, self.dlink
+
+        p = node - 1
+        while p != node:
+            column = top[p]
+            if column <= 0:
+                p = dlink[p]
+            else:
+                self.uncover(column)
+                p -= 1
+
+
+    def choose_column(self):
+        top, rlink = self.top, self.rlink
+
+        heuristic = self.heuristic
+        if heuristic == 'first':
+            return rlink[0]
+        if heuristic != 'mrv':
+            return self.choose_column_tied()
+
+        chosen_column = rlink[0]
+        min_size = top[chosen_column]
+
+        current_column = rlink[chosen_column]
+        while current_column != 0:
+
+            # Check if this column has lesser nodes
+            if top[current_column] < min_size:
+                chosen_column = current_column
+                min_size = top[current_column]
+
+            current_column = rlink[current_column]
+
+        return chosen_column
+
+
+    def choose_column_tied(self):
+        # Collect every column with the fewest nodes and let the heuristic pick one
+        top, rlink = self.top, self.rlink
+
+        tied = []
+        min_size = None
+
+        current_column = rlink[0]
+        while current_column != 0:
+            if min_size is None or top[current_column] < min_size:
+                tied = [current_column - 1]
+                min_size = top[current_column]
+            elif top[current_column] == min_size:
+                tied.append(current_column - 1)
+
+            current_column = rlink[current_column]
+
+        return self.break_tie(tied) + 1
+
+
+    def is_solved(self):
+        return self.rlink[0] == 0
+
+
+    def branch_column(self):
+        dlink = self.dlink
+
+        chosen_column = self.choose_column()
+        self.cover(chosen_column)
+
+        options = []
+        node = dlink[chosen_column]
+        while node != chosen_column:
+            options.append(node)
+            node = dlink[node]
+
+        return chosen_column, options
+
+
+    def choose_option(self, node):
+        self.solution.append(node)
+        self.cover_row(node)
+
+
+    def unchoose_option(self, node):
+        self.solution.pop()
+        self.uncover_row(node)
+
+
+    def release_column(self, column):
+        self.uncover(column)
+
+
+    def exclude_columns(self, columns):
+        for col_ind in columns:
+            self.cover(col_ind + 1)
+
+
+    def include_columns(self, columns):
+        for col_ind in reversed(columns):
+            self.uncover(col_ind + 1)
+
+
+    def unwind(self, depth=0):
+        while len(self.solution) > depth:
+            node = self.solution.pop()
+            self.uncover_row(node)
+            self.uncover(self.top[node])
+
+
+    def hide_row(self, row_ind):
+        top, ulink, dlink = self.top, self.ulink, self.dlink
+
+        p = self.first_row_nodes[row_ind]
+        while top[p] > 0:
+            u, d = ulink[p], dlink[p]
+            dlink[u] = d
+            ulink[d] = u
+            top[top[p]] -= 1
+            p += 1
+
+
+    def unhide_row(self, row_ind):
+        top, ulink, dlink = self.top, self.ulink, self.dlink
+
+        # Relink in reverse order, from the last node of the option
+        first = self.first_row_nodes[row_ind]
+        p = first
+        while top[p + 1] > 0:
+            p += 1
+        while p >= first:
+            dlink[ulink[p]] = p
+            ulink[dlink[p]] = p
+            top[top[p]] += 1
+            p -= 1
+
+
+    def append_row(self, columns):
+        top, ulink, dlink, row = self.top, self.ulink, self.dlink, self.row
+
+        row_ind = len(self.first_row_nodes)
+        if not columns:
+            self.first_row_nodes.append(-1)
+            return row_ind
+
+        # The new option goes after the last spacer and gets a spacer of its own
+        spacer = len(top) - 1
+        for col_ind in columns:
+            node, column = len(top), col_ind + 1
+            top.append(column)
+            ulink.append(ulink[column])
+            dlink.append(column)
+            row.append(row_ind)
+
+            # At the bottom of the column
+            dlink[ulink[column]] = node
+            ulink[column] = node
+            top[column] += 1
+
+        dlink[spacer] = len(top) - 1
+        top.append(-row_ind - 1)
+        ulink.append(spacer + 1)
+        dlink.append(len(dlink))
+        row.append(-1)
+
+        self.first_row_nodes.append(spacer + 1)
+        return row_ind
+
+
+    def pop_row(self):
+        first = self.first_row_nodes[-1]
+        if first >= 0:
+            self.hide_row(len(self.first_row_nodes) - 1)
+            for links in (self.top, self.ulink, self.dlink, self.row):
+                del links[first:]
+            self.dlink[first - 1] = first - 1  # The last spacer links to itself
+        self.first_row_nodes.pop()
+
+
+    def get_state(self):
+        """
+        The choice stack as a list of (row, column) pairs, safe to pickle / dump as JSON.
+        """
+        return [(self.row[node], self.top[node] - 1) for node in self.solution]
+
+
+    def restore_state(self, state):
+        """
+        Replays a choice stack from get_state() on a freshly built instance.
+        """
+        dlink, row = self.dlink, self.row
+
+        for row_ind, col_ind in state:
+            column = col_ind + 1
+            self.cover(column)
+
+            node = dlink[column]
+            while node != column and row[node] != row_ind:
+                node = dlink[node]
+            if node == column:
+                raise ValueError(f'Row {row_ind} is not available in column {col_ind}')
+
+            self.solution.append(node)
+            self.cover_row(node)
+
+
+    def cover_pre_solution(self, pre_solution):
+        """
+        Puts the given rows into the partial solution and covers all of their items / columns.
+        Returns False without covering anything if a row is empty or two rows share a column, also
+        with a row already in the partial solution.
+        """
+        top, first_row_nodes = self.top, self.first_row_nodes
+
+        # Columns of the rows already in the partial solution
+        nodes, columns = [], set()
+        for node in self.solution:
+            p = first_row_nodes[self.row[node]]
+            while top[p] > 0:
+                columns.add(top[p])
+                p += 1
+
+        for row_index in pre_solution:
+            node = first_row_nodes[row_index] if 0 <= row_index < len(first_row_nodes) else -1
+            if node < 0:
+                return False
+            nodes.append(node)
+
+            # Nodes of an option are stored next to each other up to the following spacer
+            p = node
+            while top[p] > 0:
+                if top[p] in columns:
+                    return False
+                columns.add(top[p])
+                p += 1
+
+        for node in nodes:
+            self.solution.append(node)
+            self.cover(top[node])
+            self.cover_row(node)
+
+        return True
+
+
+    def get_rows(self):
+        return [self.row[node] for node in self.solution]
+
+
+    def iter_solutions(self, state=None, pre_solution=None, max_depth=None, with_rows=True):
+        """
+        Yields every solution (list of row indices) lazily, using an explicit choice stack instead of recursion.
+
+        The generator can be paused after any solution and the position saved with get_state().
+        Passing that state (and the same pre_solution) to iter_solutions of a new instance built from
+        the same matrix carries on with the solutions after it.
+
+        pre_solution rows are covered up front and are part of every solution, as are the fixed rows.
+        With max_depth the search stops descending after that many choices and yields the partial
+        solutions instead, this is how parallel_search splits the work.
+        With with_rows=False None is yielded for every solution, for counting.
+        """
+        top, dlink, rlink, row = self.top, self.dlink, self.rlink, self.row
+        stack = self.solution
+
+        # Fixed rows stay at the bottom of the stack, anything a previous search left above them goes
+        self.unwind(len(self.fixed))
+        floor = len(self.solution)
+        if pre_solution is not None:
+            if not self.cover_pre_solution(pre_solution):
+                return
+            floor += len(pre_solution)
+
+        if state is not None:
+            self.restore_state(state[floor:])
+        backtrack = state is not None
+
+        while True:
+            if backtrack:
+                if len(stack) == floor:
+                    return
+
+                # Current option doesn't work - Backtrack and try the next option for partial solution
+                current_node = stack.pop()
+                self.uncover_row(current_node)
+                chosen_column = top[current_node]
+                current_node = dlink[current_node]
+
+            # Solution found if there are no items (columns) left
+            elif rlink[0] == 0 or len(stack) - floor == max_depth:
+                yield [row[node] for node in stack] if with_rows else None
+                backtrack = True
+                continue
+
+            else:
+                chosen_column = self.choose_column()
+                self.cover(chosen_column)
+                current_node = dlink[chosen_column]
+
+            if current_node == chosen_column:  # No options left in this column
+                self.uncover(chosen_column)
+                backtrack = True
+            else:
+                # Including the option / row containing current_node in partial solution
+                stack.append(current_node)
+                self.cover_row(current_node)
+                backtrack = False
@@ -0,0 +1,656 @@
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import repeat
+import functools
+import random
+import numpy as np
+
+
+def to_coo(matrix):
+    """
+    Returns (rows, cols, n_cols) -- the row and column indices of the nonzero entries of matrix.
+    matrix may be a dense array / list of lists or any scipy.sparse matrix.
+    """
+    if hasattr(matrix, 'tocoo'):  # scipy.sparse
+        coo = matrix.tocoo()
+        nonzero = coo.data != 0
+        return coo.row[nonzero], coo.col[nonzero], coo.shape[1]
+
+    matrix = np.asarray(matrix)
+    rows, cols = np.nonzero(matrix)
+    return rows, cols, matrix.shape[1]
+
+
+def sort_coo(rows, cols):
+    """
+    Sorts the entries row by row (and by column within a row) and drops repeated entries.
+    """
+    rows = np.asarray(rows, dtype=np.int64)
+    cols = np.asarray(cols, dtype=np.int64)
+
+    order = np.lexsort((cols, rows))
+    rows, cols = rows[order], cols[order]
+
+    keep = np.ones(len(rows), dtype=bool)
+    keep[1:] = (rows[1:] != rows[:-1]) | (cols[1:] != cols[:-1])
+    return rows[keep], cols[keep]
+
+
+# Set in every parallel_search worker process by init_parallel_worker
+_worker_builder = None
+_worker_coo = None
+
+
+def init_parallel_worker(builder, coo):
+    global _worker_builder, _worker_coo
+    _worker_builder, _worker_coo = builder, coo
+
+
+def kill_workers(executor):
+    """
+    Shuts the ProcessPoolExecutor down without waiting for the tasks still running, killing their
+    processes. The executor notices its workers died and cleans up after them.
+    """
+    if hasattr(executor, 'kill_workers'):  # Python 3.14
+        executor.kill_workers()
+        return
+
+    processes = list((executor._processes or {}).values())
+    executor.shutdown(wait=False, cancel_futures=True)
+    for process in processes:
+        process.kill()
+    for process in processes:
+        process.join()
+
+
+def search_prefix(pre_solution, mode):
+    """
+    Rebuilds the solver in a worker process and searches below the pre-covered prefix.
+    mode is 'all' (returns every solution), 'first' (the first one or an empty list) or 'count'.
+    """
+    dl = _worker_builder(*_worker_coo)
+
+    if mode == 'count':
+        return dl.count_solutions(pre_solution=pre_solution)
+    if mode == 'all':
+        dl.search(multi_solution_flag=True, pre_solution=pre_solution)
+        return dl.all_solutions
+    return dl.get_rows() if dl.search(pre_solution=pre_solution) else []
+
+
+class ExactCover:
+    """
+    Interface shared by every exact cover backend.
+
+    A backend wires its structure in _link from the sorted row / column indices of the nonzero
+    entries and implements iter_solutions, cover_pre_solution, get_rows, get_state and restore_state.
+    Searching, solving and the parallel driver are built on top of those. Memoized counting drives
+    the backend one step at a time through is_solved, branch_column, choose_option, unchoose_option
+    and release_column.
+
+    Once built, rows can be added, removed and fixed (put into every solution, like clues) without
+    rebuilding anything, every change being reverted by undo(). The backend links rows in and out
+    through append_row, pop_row, hide_row and unhide_row.
+
+    Columns listed in secondary are Knuth's secondary items -- they may be covered at most once but
+    need not be covered at all. They are never chosen to branch on and a solution only has to cover
+    every primary column.
+
+    heuristic picks the column to branch on:
+        mrv      -- fewest options left, ties go to the lowest column (default)
+        first    -- the lowest uncovered column, without looking at sizes
+        random   -- fewest options left, ties broken at random (seeded with seed)
+        weighted -- fewest options left, ties go to the column with the most options in the full matrix
+    Every heuristic finds the same solutions, only mrv enumerates them in the same order on every
+    backend.
+    """
+    HEURISTICS = ('mrv', 'first', 'random', 'weighted')
+
+    def __init__(self, matrix: np.ndarray, **kwargs):
+        rows, cols, n_cols = to_coo(matrix)
+        n_rows = matrix.shape[0] if hasattr(matrix, 'tocoo') else len(matrix)  # Trailing empty rows too
+        self._build(rows, cols, n_cols, n_rows, **kwargs)
+
+
+    @classmethod
+    def from_coo(cls, rows, cols, n_cols=None, n_rows=None, **kwargs):
+        """
+        Builds the solver straight from the row / column indices of the nonzero entries.
+        n_cols / n_rows default to one past the last column / row with an entry.
+        """
+        dl = cls.__new__(cls)
+        dl._build(rows, cols, n_cols, n_rows, **kwargs)
+        return dl
+
+
+    @classmethod
+    def from_sparse(cls, matrix, **kwargs):
+        """
+        Builds the solver from a scipy.sparse matrix (CSR, COO, ...) without densifying it.
+        """
+        rows, cols, n_cols = to_coo(matrix)
+        return cls.from_coo(rows, cols, n_cols, matrix.shape[0], **kwargs)
+
+
+    @classmethod
+    def from_csr(cls, indptr, indices, n_cols, **kwargs):
+        """
+        Builds the solver from CSR index arrays (e.g. memory-mapped ones).
+        """
+        rows = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+        return cls.from_coo(rows, indices, n_cols, len(indptr) - 1, **kwargs)
+
+
+    @classmethod
+    def from_file(cls, path, **kwargs):
+        """
+        Builds the solver from a matrix saved with exact_cover.storage.
+        """
+        from .storage import load
+        stored = load(path)
+        return cls.from_csr(stored.indptr, stored.indices, stored.n_cols, **kwargs)
+
+
+    def _build(self, rows, cols, n_cols=None, n_rows=None, secondary=None, heuristic='mrv', seed=None, **kwargs):
+        if heuristic not in self.HEURISTICS:
+            raise ValueError(f'Unknown heuristic {heuristic!r}, expected one of {list(self.HEURISTICS)}')
+
+        self.solution = []
+        self.fixed = []  # Rows put into every solution with fix_row, at the bottom of self.solution
+        self.removed = set()
+        self.history = []  # (operation, row, columns) for undo
+        self.no_of_solutions = 0
+        self.all_solutions = []
+
+        rows, cols = sort_coo(rows, cols)
+        if n_cols is None:
+            n_cols = int(cols.max()) + 1 if len(cols) else 0
+        self.n_cols = n_cols
+        if n_rows is None:
+            n_rows = int(rows.max()) + 1 if len(rows) else 0
+        elif len(rows) and rows[-1] >= n_rows:
+            raise ValueError(f'Row {rows[-1]} out of range for {n_rows} rows')
+        self.n_rows = n_rows  # New rows are numbered from here on, even past empty rows at the bottom
+
+        self.primary = np.ones(n_cols, dtype=bool)
+        if secondary is not None:
+            secondary = sorted(int(col_ind) for col_ind in secondary)
+            self.primary[secondary] = False
+
+        self.heuristic = heuristic
+        self.random = random.Random(seed)
+        self.degree = np.bincount(cols, minlength=n_cols).tolist()  # Options per column in the full matrix
+        self.reset_stats()
+
+        # Kept so that parallel_search workers can rebuild the same solver
+        self.coo = (rows, cols, n_cols)
+        self.build_kwargs = dict(kwargs, secondary=secondary, heuristic=heuristic, seed=seed)
+
+        self._link(rows, cols, n_cols, **kwargs)
+
+
+    def _link(self, rows, cols, n_cols):
+        raise NotImplementedError
+
+
+    def iter_solutions(self, state=None, pre_solution=None, max_depth=None):
+        raise NotImplementedError
+
+
+    def cover_pre_solution(self, pre_solution):
+        raise NotImplementedError
+
+
+    def get_rows(self):
+        raise NotImplementedError
+
+
+    def get_state(self):
+        raise NotImplementedError
+
+
+    def restore_state(self, state):
+        raise NotImplementedError
+
+
+    def break_tie(self, columns):
+        """
+        Picks one of columns (indices, in increasing order), all with the fewest options left.
+        """
+        if self.heuristic == 'random':
+            return self.random.choice(columns)
+        if self.heuristic == 'weighted':
+            return max(columns, key=self.degree.__getitem__)
+        return columns[0]
+
+
+    def reset_stats(self):
+        levels = self.n_cols + 1  # Rows in a partial solution never outnumber the columns
+        self.level_nodes = [0] * levels
+        self.level_covers = [0] * levels
+        self.level_updates = [0] * levels
+
+
+    @property
+    def stats(self):
+        """
+        Counters of the last search / count_solutions, in total and per level (the number of rows in
+        the partial solution when the work was done):
+            nodes   -- options tried
+            covers  -- columns covered
+            updates -- links removed while covering (Knuth's updates), columns sized by BitsetExactCover
+        """
+        counters = zip(self.level_nodes, self.level_covers, self.level_updates)
+        depth = max((level + 1 for level, counts in enumerate(counters) if any(counts)), default=0)
+        return {
+            'nodes': sum(self.level_nodes),
+            'covers': sum(self.level_covers),
+            'updates': sum(self.level_updates),
+            'nodes_per_level': self.level_nodes[:depth],
+            'covers_per_level': self.level_covers[:depth],
+            'updates_per_level': self.level_updates[:depth],
+        }
+
+
+    def print_solution(self):
+        for row_ind in self.get_rows():
+            print(f'Option {row_ind}')
+
+
+    def search(self, k=0, multi_solution_flag=False, pre_solution=None, sink=None):
+        """
+        Returns True as soon as one solution is found, leaving it in self.solution.
+        With multi_solution_flag every solution is stored in self.all_solutions instead, or passed to
+        sink (any callable taking the list of rows) so that nothing is kept in memory.
+        k is only kept for backwards compatibility, the search does not recurse.
+        The work done is counted in self.stats.
+        """
+        self.reset_stats()
+        for solution in self.iter_solutions(pre_solution=pre_solution):
+            if not multi_solution_flag:
+                return True
+
+            self.no_of_solutions += 1
+            if sink is None:
+                self.all_solutions.append(solution)
+            else:
+                sink(solution)
+
+        return False
+
+
+    def count_solutions(self, pre_solution=None, memo_size=None):
+        """
+        Counts the solutions without building or storing any of them.
+        With memo_size the counts of residual problems are cached (see count_solutions_memoized).
+        The count is also added to self.no_of_solutions and the work done is counted in self.stats.
+        """
+        self.reset_stats()
+        if memo_size is not None:
+            self.unwind(len(self.fixed))
+            if pre_solution is not None and not self.cover_pre_solution(pre_solution):
+                return 0
+            count = self.count_solutions_memoized(memo_size)
+            self.no_of_solutions += count
+            return count
+
+        count = 0
+        for _ in self.iter_solutions(pre_solution=pre_solution, with_rows=False):
+            count += 1
+
+        self.no_of_solutions += count
+        return count
+
+
+    def count_up_to(self, k, pre_solution=None):
+        """
+        Counts the solutions but stops as soon as k are found -- count_up_to(2) tells 0, 1 or more
+        solutions apart without enumerating them. The work done is counted in self.stats.
+        """
+        self.reset_stats()
+        count = 0
+        if k <= 0:
+            return count
+
+        for _ in self.iter_solutions(pre_solution=pre_solution, with_rows=False):
+            count += 1
+            if count == k:
+                break
+        return count
+
+
+    def is_unique(self, pre_solution=None):
+        """
+        Whether there is exactly one solution (with the pre_solution rows).
+        """
+        return self.count_up_to(2, pre_solution=pre_solution) == 1
+
+
+    def is_solved(self):
+        raise NotImplementedError
+
+
+    def branch_column(self):
+        """
+        Chooses and covers the column to branch on, returns (column, options in that column).
+        """
+        raise NotImplementedError
+
+
+    def choose_option(self, option):
+        raise NotImplementedError
+
+
+    def unchoose_option(self, option):
+        raise NotImplementedError
+
+
+    def release_column(self, column):
+        raise NotImplementedError
+
+
+    def covered_key(self):
+        """
+        Bit mask of every column covered by the partial solution -- the residual problem only depends on it.
+        """
+        if not hasattr(self, '_row_masks'):
+            rows, cols, _ = self.coo
+            self._row_masks = dict()
+            for row_ind, col_ind in zip(rows.tolist(), cols.tolist()):
+                self._row_masks[row_ind] = self._row_masks.get(row_ind, 0) | 1 << col_ind
+
+        key = 0
+        for row_ind in self.get_rows():
+            key |= self._row_masks[row_ind]
+        return key
+
+
+    def count_solutions_memoized(self, memo_size=2**20):
+        """
+        Counts the solutions, caching the count of every residual problem (keyed on the covered columns)
+        in an LRU table of at most memo_size entries. Boards that are reached through different
+        branches with the same cells filled are only counted once.
+        """
+        memo = OrderedDict()
+        frames = []  # [key, column, options, index of the chosen option, count so far]
+        count = None  # Count of the subproblem that has just been finished, None to start a new one
+
+        while True:
+            if count is None:
+                if self.is_solved():
+                    count = 1
+                    continue
+
+                key = self.covered_key()
+                if key in memo:
+                    memo.move_to_end(key)
+                    count = memo[key]
+                    continue
+
+                column, options = self.branch_column()
+                frames.append([key, column, options, -1, 0])
+                count = 0
+
+            if not frames:
+                return count
+
+            frame = frames[-1]
+            key, column, options, index, total = frame
+            if index >= 0:
+                self.unchoose_option(options[index])
+            total += count
+            index += 1
+
+            if index < len(options):
+                # Go into the next option of this column
+                self.choose_option(options[index])
+                frame[3], frame[4] = index, total
+                count = None
+            else:
+                # Every option of this column is done
+                self.release_column(column)
+                frames.pop()
+
+                memo[key] = total
+                if len(memo) > memo_size:
+                    memo.popitem(last=False)
+                count = total
+
+
+    def parallel_search(self, workers=None, depth=1, multi_solution_flag=True, sink=None, count_only=False):
+        """
+        Splits the search tree at its first depth branching levels and searches every subtree in a
+        ProcessPoolExecutor. Solutions are merged into all_solutions / no_of_solutions (or passed to
+        sink) in the same order as search() would find them. With count_only the workers only count
+        and the number of solutions is returned.
+        Without multi_solution_flag the first solution any worker finds is put into self.solution,
+        and the workers still searching other subtrees are killed.
+
+        Scripts calling this should be guarded by if __name__ == '__main__' where processes are spawned.
+        """
+        prefixes = list(self.iter_solutions(max_depth=depth))
+        builder = functools.partial(type(self).from_coo, **self.build_kwargs)
+
+        # Not a with block, whose exit would wait for every subtree after a first solution
+        executor = ProcessPoolExecutor(workers, initializer=init_parallel_worker, initargs=(builder, self.coo))
+        try:
+            if count_only:
+                count = sum(executor.map(search_prefix, prefixes, repeat('count')))
+                self.no_of_solutions += count
+                return count
+
+            if multi_solution_flag:
+                for solutions in executor.map(search_prefix, prefixes, repeat('all')):
+                    self.no_of_solutions += len(solutions)
+                    if sink is None:
+                        self.all_solutions.extend(solutions)
+                    else:
+                        for solution in solutions:
+                            sink(solution)
+                return False
+
+            futures = [executor.submit(search_prefix, prefix, 'first') for prefix in prefixes]
+            for future in as_completed(futures):
+                solution = future.result()
+                if solution:
+                    kill_workers(executor)
+
+                    # The worker's solution starts with the fixed rows, which stay covered here
+                    self.unwind(len(self.fixed))
+                    return self.cover_pre_solution([row_ind for row_ind in solution if row_ind not in self.fixed])
+
+            return False
+        finally:
+            executor.shutdown()
+
+
+    def covered_columns(self):
+        """
+        The columns covered by the rows of the partial solution, in O(nnz).
+        """
+        rows, cols, _ = self.coo
+        return set(cols[np.isin(rows, self.get_rows())].tolist())
+
+
+    def exclude_columns(self, columns):
+        """
+        Takes the columns out of the problem along with every row that has an entry in them, until
+        include_columns is called with the same columns. None of them may be covered already.
+        """
+        raise NotImplementedError
+
+
+    def include_columns(self, columns):
+        raise NotImplementedError
+
+
+    def unwind(self, depth=0):
+        """
+        Takes the rows after the first depth out of the partial solution, uncovering their columns.
+        """
+        raise NotImplementedError
+
+
+    def search_batch(self, instances, multi_solution_flag=False, count_only=False):
+        """
+        Solves many instances that are all this matrix minus some columns, each given by the columns
+        it excludes (with every row that has an entry in them), without building anything again.
+        Yields for every instance the sorted rows of its first solution or False, the list of all its
+        solutions with multi_solution_flag, or the number of solutions with count_only.
+        Row indices are those of the full matrix.
+        """
+        depth = len(self.fixed)
+        self.unwind(depth)  # Only the fixed rows stay covered under the excluded columns
+        covered = self.covered_columns()  # Out of the problem already, once for the whole batch
+        for excluded in instances:
+            excluded = sorted({int(col_ind) for col_ind in excluded} - covered)
+            self.exclude_columns(excluded)
+
+            if count_only:
+                result = sum(1 for _ in self.iter_solutions(with_rows=False))
+            elif multi_solution_flag:
+                result = list(self.iter_solutions())
+            else:
+                result = next(self.iter_solutions(), None)
+                result = False if result is None else sorted(result)
+                self.unwind(depth)
+
+            self.include_columns(excluded)
+            yield result
+
+
+    def hide_row(self, row_ind):
+        raise NotImplementedError
+
+
+    def unhide_row(self, row_ind):
+        raise NotImplementedError
+
+
+    def append_row(self, columns):
+        """
+        Links a new row with entries in the given (sorted) columns after the last one, returns its index.
+        """
+        raise NotImplementedError
+
+
+    def pop_row(self):
+        raise NotImplementedError
+
+
+    def _restructure(self, change, *args):
+        # Links are only changed with nothing covered, the fixed rows are covered again afterwards
+        self.unwind(0)
+        result = change(*args)
+        self.cover_pre_solution(self.fixed)
+        self.__dict__.pop('_row_masks', None)
+        return result
+
+
+    def _add_coo(self, row_ind, columns):
+        rows, cols, n_cols = self.coo
+        rows, cols = sort_coo(np.append(rows, [row_ind] * len(columns)), np.append(cols, columns))
+        self.coo = (rows, cols, n_cols)
+        for col_ind in columns:
+            self.degree[col_ind] += 1
+
+
+    def _remove_coo(self, row_ind, columns):
+        rows, cols, n_cols = self.coo
+        keep = rows != row_ind
+        self.coo = (rows[keep], cols[keep], n_cols)
+        for col_ind in columns:
+            self.degree[col_ind] -= 1
+
+
+    def add_row(self, columns):
+        """
+        Adds a row with entries in the given columns to the built structure, returns its index.
+        """
+        columns = sorted({int(col_ind) for col_ind in columns})
+        if columns and not 0 <= columns[0] <= columns[-1] < self.n_cols:
+            raise ValueError(f'Columns {columns} out of range for {self.n_cols} columns')
+
+        row_ind = self._restructure(self.append_row, columns)
+        self.n_rows += 1
+        self._add_coo(row_ind, columns)
+        self.history.append(('add', row_ind, columns))
+        return row_ind
+
+
+    def remove_row(self, row_ind):
+        """
+        Takes the row out of the built structure, until it is put back by undo().
+        """
+        if row_ind in self.fixed or row_ind in self.removed:
+            raise ValueError(f'Row {row_ind} is fixed or already removed')
+
+        rows, cols, _ = self.coo
+        columns = cols[rows == row_ind].tolist()
+        if not columns:
+            raise ValueError(f'Row {row_ind} has no entries')
+
+        self._restructure(self.hide_row, row_ind)
+        self._remove_coo(row_ind, columns)
+        self.removed.add(row_ind)
+        self.history.append(('remove', row_ind, columns))
+
+
+    def fix_row(self, row_ind):
+        """
+        Puts the row into every solution found from now on (a clue).
+        Returns False without changing anything if it is empty, removed or shares a column with a fixed row.
+        """
+        if not self._fix(row_ind):
+            return False
+        self.history.append(('fix', row_ind, None))
+        return True
+
+
+    def unfix_row(self, row_ind):
+        if row_ind not in self.fixed:
+            raise ValueError(f'Row {row_ind} is not fixed')
+        self._unfix(row_ind)
+        self.history.append(('unfix', row_ind, None))
+
+
+    def _fix(self, row_ind):
+        self.unwind(len(self.fixed))
+        if row_ind in self.removed or not self.cover_pre_solution([row_ind]):
+            return False
+        self.fixed.append(row_ind)
+        return True
+
+
+    def _unfix(self, row_ind):
+        # Uncover the rows fixed after it too, and cover those again
+        depth = self.fixed.index(row_ind)
+        self.unwind(depth)
+        del self.fixed[depth]
+        self.cover_pre_solution(self.fixed[depth:])
+
+
+    def undo(self):
+        """
+        Reverts the last add_row, remove_row, fix_row or unfix_row.
+        """
+        operation, row_ind, columns = self.history.pop()
+        if operation == 'add':
+            self._restructure(self.pop_row)
+            self.n_rows -= 1
+            self._remove_coo(row_ind, columns)
+        elif operation == 'remove':
+            self._restructure(self.unhide_row, row_ind)
+            self._add_coo(row_ind, columns)
+            self.removed.discard(row_ind)
+        elif operation == 'fix':
+            self._unfix(row_ind)
+        else:
+            self._fix(row_ind)
+
+
+    def solve(self, pre_solution=None):
+        if self.search(pre_solution=pre_solution):
+            return sorted(self.get_rows())
+        else:
+            return False
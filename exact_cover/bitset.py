@@ -0,0 +1,396 @@
+import numpy as np
+
+from .base import ExactCover
+
+
+try:
+    popcount = int.bit_count
+except AttributeError:  # Python < 3.10
+    def popcount(mask):
+        """
+        Number of set bits of mask.
+        """
+        return bin(mask).count('1')
+
+
+def mask_rows(mask):
+    """
+    Indices of the set bits of mask in increasing order.
+    """
+    rows = []
+    while mask:
+        low_bit = mask & -mask
+        rows.append(low_bit.bit_length() - 1)
+        mask ^= low_bit
+    return rows
+
+
+def permutation_group(generators, n):
+    """
+    Every permutation of range(n) generated by composing the given ones, except the identity.
+    """
+    generators = [tuple(int(i) for i in perm) for perm in generators]
+    for perm in generators:
+        if sorted(perm) != list(range(n)):
+            raise ValueError(f'{list(perm)} is not a permutation of the {n} columns')
+
+    identity = tuple(range(n))
+    group, frontier = {identity}, [identity]
+    while frontier:
+        perm = frontier.pop()
+        for generator in generators:
+            composed = tuple(generator[i] for i in perm)
+            if composed not in group:
+                group.add(composed)
+                frontier.append(composed)
+
+    group.discard(identity)
+    return sorted(group)
+
+
+class BitsetExactCover(ExactCover):
+    """
+    Exact cover for small universes where every row fits in a Python int bit mask.
+
+    Instead of unlinking nodes the search keeps two masks: the uncovered columns and the alive rows,
+    those that share no column with a chosen row. Every column also has the mask of the rows it
+    appears in, so its candidates are column_masks[column] & alive and its size a popcount, and
+    choosing a row drops all rows conflicting with it in one operation. Columns and rows are tried
+    in the same order as the Dancing Links backends, so the solutions come out in the same order.
+
+    symmetries is a list of column permutations (perm[column] is the column it maps to) generating a
+    group that maps the matrix onto itself, e.g. rotating a tower or reflecting a board. Only the
+    solution that is smallest as a sorted list of rows in its orbit is found; branches are cut as
+    soon as some symmetry is known to map the partial solution onto a smaller one, whatever rows are
+    added to it.
+    """
+    def _link(self, rows, cols, n_cols, symmetries=None):
+        n_rows = self.n_rows
+        entries = list(zip(rows.tolist(), cols.tolist()))
+
+        self.row_masks = [0] * n_rows
+        self.column_masks = [0] * n_cols
+        for row_ind, col_ind in entries:
+            self.row_masks[row_ind] |= 1 << col_ind
+            self.column_masks[col_ind] |= 1 << row_ind
+
+        # Every row sharing a column with the row (itself included)
+        self.conflicts = [0] * n_rows
+        for row_ind, col_ind in entries:
+            self.conflicts[row_ind] |= self.column_masks[col_ind]
+
+        self.uncovered = (1 << n_cols) - 1
+        self.alive = 0  # Empty rows are never alive
+        for column_mask in self.column_masks:
+            self.alive |= column_mask
+        self.chosen = 0
+        self.primary_mask = sum(1 << int(col_ind) for col_ind in np.flatnonzero(self.primary))
+
+        # The rows every symmetry maps the rows to, and the images of (chosen, alive) under it
+        self.row_perms = [self.row_permutation(perm) for perm in permutation_group(symmetries or [], n_cols)]
+        self.images = [(self.chosen, self.alive)] * len(self.row_perms)
+
+        # [column, candidate rows, index of the chosen candidate, alive rows and images before it] for every row in self.solution
+        self.levels = []
+        self.exclusions = []  # (uncovered, alive) before every exclude_columns
+
+
+    def row_permutation(self, perm):
+        """
+        Maps every row onto the row whose columns are the images of its columns under perm.
+        """
+        if any(self.primary[col_ind] != self.primary[perm[col_ind]] for col_ind in range(self.n_cols)):
+            raise ValueError(f'{list(perm)} maps a primary column onto a secondary one')
+
+        # Identical rows are mapped onto each other in order
+        rows_with_mask = dict()
+        for row_ind, row_mask in enumerate(self.row_masks):
+            rows_with_mask.setdefault(row_mask, []).append(row_ind)
+
+        row_perm = [None] * len(self.row_masks)
+        for row_mask, row_inds in rows_with_mask.items():
+            image = sum(1 << perm[col_ind] for col_ind in mask_rows(row_mask))
+            image_rows = rows_with_mask.get(image, [])
+            if len(image_rows) != len(row_inds):
+                raise ValueError(f'{list(perm)} does not map the rows of the matrix onto each other')
+            for row_ind, image_row in zip(row_inds, image_rows):
+                row_perm[row_ind] = image_row
+
+        return row_perm
+
+
+    def choose_column(self):
+        """
+        Returns the uncovered primary column chosen by the heuristic, along with its available rows.
+        """
+        column_masks, alive = self.column_masks, self.alive
+        heuristic = self.heuristic
+
+        chosen_column, min_size = None, None
+        tied = []  # Every column with the fewest rows, unless the lowest one is enough
+        remaining = self.uncovered & self.primary_mask
+        checked = popcount(remaining)
+        while remaining:
+            low_bit = remaining & -remaining
+            remaining ^= low_bit
+            column = low_bit.bit_length() - 1
+
+            size = popcount(column_masks[column] & alive)
+            if min_size is None or size < min_size:
+                chosen_column, min_size = column, size
+                tied = [column]
+                if not size or heuristic == 'first':
+                    break
+            elif size == min_size and heuristic != 'mrv':
+                tied.append(column)
+
+        self.level_updates[len(self.solution)] += checked - popcount(remaining)
+        if len(tied) > 1:
+            chosen_column = self.break_tie(tied)
+
+        return chosen_column, mask_rows(column_masks[chosen_column] & alive)
+
+
+    def push(self, column, rows, index):
+        row_ind = rows[index]
+        self.levels.append([column, rows, index, self.alive, self.images])
+        self.solution.append(row_ind)
+        self.uncovered &= ~self.row_masks[row_ind]
+        self.alive &= ~self.conflicts[row_ind]
+        self.chosen |= 1 << row_ind
+
+        if self.row_perms:
+            # A symmetry maps the rows conflicting with a row onto those conflicting with its image
+            conflicts = self.conflicts
+            self.images = [
+                (chosen | 1 << row_perm[row_ind], alive & ~conflicts[row_perm[row_ind]])
+                for row_perm, (chosen, alive) in zip(self.row_perms, self.images)
+            ]
+
+        level = len(self.solution)
+        self.level_nodes[level] += 1
+        self.level_covers[level] += popcount(self.row_masks[row_ind])
+
+
+    def pop(self):
+        row_ind = self.solution.pop()
+        self.uncovered |= self.row_masks[row_ind]
+        self.chosen ^= 1 << row_ind
+        column, rows, index, self.alive, self.images = self.levels.pop()
+        return column, rows, index
+
+
+    def breaks_symmetry(self):
+        """
+        True if some symmetry maps every completion of the partial solution onto a smaller solution.
+
+        Rows are either chosen, dead (sharing a column with a chosen row) or still undecided. Sorted
+        row lists compare on the lowest row in only one of them, so the partial solution is beaten
+        when the lowest row decided differently in it and in its image is chosen only in the image,
+        and no undecided row comes before it.
+        """
+        chosen, alive = self.chosen, self.alive
+        solved = not self.uncovered & self.primary_mask
+
+        for image_chosen, image_alive in self.images:
+            if solved:  # Rows that are still alive can no longer be added
+                differ = chosen ^ image_chosen
+                undecided = 0
+            else:
+                differ = chosen & ~image_alive & ~image_chosen | image_chosen & ~alive & ~chosen
+                undecided = alive | image_alive
+
+            lowest = differ & -differ
+            if lowest & image_chosen and not undecided & (lowest - 1):
+                return True
+
+        return False
+
+
+    def is_solved(self):
+        return not self.uncovered & self.primary_mask
+
+
+    def branch_column(self):
+        return self.choose_column()
+
+
+    def choose_option(self, row_ind):
+        self.push(None, [row_ind], 0)
+
+
+    def unchoose_option(self, row_ind):
+        self.pop()
+
+
+    def release_column(self, column):
+        pass
+
+
+    def count_solutions_memoized(self, memo_size=2**20):
+        if self.row_perms:
+            raise ValueError('Residual problems cannot be memoized when breaking symmetries')
+        return super().count_solutions_memoized(memo_size)
+
+
+    def covered_key(self):
+        return self.uncovered
+
+
+    def exclude_columns(self, columns):
+        if self.row_perms:
+            raise ValueError('Columns cannot be excluded when breaking symmetries')
+
+        self.exclusions.append((self.uncovered, self.alive))
+        for col_ind in columns:
+            self.uncovered &= ~(1 << col_ind)
+            self.alive &= ~self.column_masks[col_ind]
+
+
+    def include_columns(self, columns):
+        self.uncovered, self.alive = self.exclusions.pop()
+
+
+    def unwind(self, depth=0):
+        while len(self.solution) > depth:
+            self.pop()
+
+
+    def _restructure(self, change, *args):
+        if self.row_perms:
+            raise ValueError('Rows cannot be changed when breaking symmetries')
+        return super()._restructure(change, *args)
+
+
+    def hide_row(self, row_ind):
+        # Rows are only ever available through the alive mask
+        self.alive &= ~(1 << row_ind)
+
+
+    def unhide_row(self, row_ind):
+        self.alive |= 1 << row_ind
+
+
+    def append_row(self, columns):
+        row_ind = len(self.row_masks)
+        bit = 1 << row_ind
+
+        row_mask = conflicts = 0
+        for col_ind in columns:
+            row_mask |= 1 << col_ind
+            self.column_masks[col_ind] |= bit
+            conflicts |= self.column_masks[col_ind]
+
+        for other_row in mask_rows(conflicts ^ bit if columns else 0):
+            self.conflicts[other_row] |= bit
+
+        self.row_masks.append(row_mask)
+        self.conflicts.append(conflicts)
+        if columns:
+            self.alive |= bit
+        return row_ind
+
+
+    def pop_row(self):
+        row_ind = len(self.row_masks) - 1
+        bit = 1 << row_ind
+
+        for col_ind in mask_rows(self.row_masks.pop()):
+            self.column_masks[col_ind] &= ~bit
+        for other_row in mask_rows(self.conflicts.pop() & ~bit):
+            self.conflicts[other_row] &= ~bit
+        self.alive &= ~bit
+
+
+    def get_state(self):
+        """
+        The choice stack as a list of (row, column) pairs, safe to pickle / dump as JSON.
+        """
+        return [(row_ind, level[0]) for row_ind, level in zip(self.solution, self.levels)]
+
+
+    def restore_state(self, state):
+        """
+        Replays a choice stack from get_state() on a freshly built instance.
+        """
+        for row_ind, col_ind in state:
+            rows = mask_rows(self.column_masks[col_ind] & self.alive)
+            if row_ind not in rows:
+                raise ValueError(f'Row {row_ind} is not available in column {col_ind}')
+            self.push(col_ind, rows, rows.index(row_ind))
+
+
+    def cover_pre_solution(self, pre_solution):
+        """
+        Puts the given rows into the partial solution and covers all of their items / columns.
+        Returns False without covering anything if a row is empty or two rows share a column.
+        """
+        covered = 0
+        for row_ind in pre_solution:
+            row_mask = self.row_masks[row_ind] if 0 <= row_ind < len(self.row_masks) else 0
+            if not row_mask or row_mask & covered or row_mask & self.uncovered != row_mask:
+                return False
+            covered |= row_mask
+
+        for row_ind in pre_solution:
+            column = (self.row_masks[row_ind] & -self.row_masks[row_ind]).bit_length() - 1
+            self.push(column, [row_ind], 0)
+
+        return True
+
+
+    def get_rows(self):
+        return list(self.solution)
+
+
+    def iter_solutions(self, state=None, pre_solution=None, max_depth=None, with_rows=True):
+        """
+        Yields every solution (list of row indices) lazily, using an explicit choice stack.
+
+        The generator can be paused after any solution and the position saved with get_state().
+        Passing that state (and the same pre_solution) to iter_solutions of a new instance built from
+        the same matrix carries on with the solutions after it.
+
+        pre_solution rows are covered up front and are part of every solution, as are the fixed rows.
+        With max_depth the search stops descending after that many choices and yields the partial
+        solutions instead.
+        With with_rows=False None is yielded for every solution, for counting.
+        """
+        stack = self.solution
+
+        # Fixed rows stay at the bottom of the stack, anything a previous search left above them goes
+        self.unwind(len(self.fixed))
+        floor = len(self.solution)
+        if pre_solution is not None:
+            if not self.cover_pre_solution(pre_solution):
+                return
+            floor += len(pre_solution)
+
+        if state is not None:
+            self.restore_state(state[floor:])
+        backtrack = state is not None
+
+        while True:
+            if backtrack:
+                if len(stack) == floor:
+                    return
+
+                # Current option doesn't work - Backtrack and try the next option for partial solution
+                column, rows, index = self.pop()
+                index += 1
+
+            # Solution found if there are no primary items (columns) left
+            elif not self.uncovered & self.primary_mask or len(stack) - floor == max_depth:
+                yield list(stack) if with_rows else None
+                backtrack = True
+                continue
+
+            else:
+                column, rows = self.choose_column()
+                index = 0
+
+            if index == len(rows):  # No options left in this column
+                backtrack = True
+            else:
+                self.push(column, rows, index)
+                backtrack = self.breaks_symmetry()
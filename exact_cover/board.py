@@ -0,0 +1,214 @@
+"""
+Board geometry for polyomino puzzles: which cells a piece fills in every position, as exact cover rows.
+
+A board is an ASCII mask, one string per row of the grid:
+    'B' / 'W' -- a black / white cell, only filled by a piece cell of the same colour
+    'o'       -- a plain cell, filled by any piece cell
+    '.'       -- no cell (off the board)
+and label(x, y), the name of the cell in row x, column y (a date, a month, ...). Pieces are lists of
+rows with 'B' / 'W' for coloured cells, 0 (or '0', as np.rot90 leaves it) for gaps and anything else
+for plain cells.
+"""
+from collections.abc import Mapping
+import numpy as np
+
+from .storage import PlacementsWriter
+
+
+NO_CELL, PLAIN, BLACK, WHITE = 0, 1, 2, 3
+CELL_CODES = {'.': NO_CELL, 'o': PLAIN, 'B': BLACK, 'W': WHITE}
+
+
+def piece_codes(piece):
+    """
+    The cells of a piece as an int array of NO_CELL / PLAIN / BLACK / WHITE.
+    """
+    return np.array([
+        [BLACK if cell == 'B' else WHITE if cell == 'W' else NO_CELL if cell in (0, '0', '') else PLAIN for cell in row]
+        for row in piece
+    ], dtype=np.int8)
+
+
+class HolePlacements(Mapping):
+    """
+    The placements of a PlacementTable that avoid a set of holes, read only: {piece number: [cells filled, ...]}
+    like a value of main_dict, the lists being made when a piece is looked up.
+    """
+    def __init__(self, table, kept):
+        self.table = table
+        self.kept = kept
+
+
+    def __getitem__(self, piece_number):
+        if not 0 <= piece_number < len(self):
+            raise KeyError(piece_number)
+        start, stop = self.table.piece_starts[piece_number], self.table.piece_starts[piece_number + 1]
+        return [self.table.cells[placement_ind] for placement_ind in (np.flatnonzero(self.kept[start:stop]) + start).tolist()]
+
+
+    def __iter__(self):
+        return iter(range(len(self)))
+
+
+    def __len__(self):
+        return len(self.table.piece_starts) - 1
+
+
+class PlacementTable(Mapping):
+    """
+    The placements of every piece on the board without holes, found once: their bit masks in one
+    array (uint64 when the grid has at most 64 squares) and the cells they fill, piece after piece.
+    table[holes] keeps the placements whose mask misses the holes with one vectorized AND, so a
+    table over hole_sets stands in for main_dict without ever building or storing it.
+    """
+    def __init__(self, board, all_placements, hole_sets=()):
+        self.board = board
+        self.hole_sets = list(hole_sets)
+        self.cells = [cells_filled for placements in all_placements for mask, cells_filled in placements]
+        self.masks = np.array(
+            [mask for placements in all_placements for mask, cells_filled in placements],
+            dtype=np.uint64 if board.grid.size <= 64 else object,
+        )
+        self.piece_starts = np.cumsum([0] + [len(placements) for placements in all_placements]).tolist()
+
+
+    def kept(self, holes):
+        """
+        Which placements don't cover the holes, as a bool array.
+        """
+        return (self.masks & self.masks.dtype.type(self.board.mask(holes))) == 0
+
+
+    def __getitem__(self, holes):
+        return HolePlacements(self, self.kept(holes))
+
+
+    def __iter__(self):
+        return iter(self.hole_sets)
+
+
+    def __len__(self):
+        return len(self.hole_sets)
+
+
+class Board:
+    """
+    The board mask compiled once into a grid of cell codes and the label of every cell, so that
+    placements are found for all positions and orientations of a piece at once.
+    Cells are numbered x * n_cols + y (their bit in the placement masks) in row-major order.
+    """
+    def __init__(self, mask, label=None):
+        if len({len(row) for row in mask}) != 1:
+            raise ValueError('Every row of the board mask should have the same length')
+        self.grid = np.array([[CELL_CODES[char] for char in row] for row in mask], dtype=np.int8)
+        self.n_rows, self.n_cols = self.grid.shape
+
+        # Square number -> label and back, for every cell (numbered 1, 2, ... row by row without label)
+        # and every other square label accepts, e.g. a hole off the board
+        self.cells = np.flatnonzero(self.grid.reshape(-1))
+        self.labels = dict()
+        for square in range(self.grid.size):
+            x, y = divmod(square, self.n_cols)
+            if label is None:
+                if self.grid[x, y] != NO_CELL:
+                    self.labels[square] = len(self.labels) + 1
+                continue
+            try:
+                self.labels[square] = label(x, y)
+            except (ValueError, AssertionError):
+                if self.grid[x, y] != NO_CELL:
+                    raise
+        self.cell_of = {cell_label: cell for cell, cell_label in self.labels.items()}
+        if len(self.cell_of) != len(self.labels):
+            raise ValueError('Two squares of the board have the same label')
+
+
+    def xy(self, cell_label):
+        return divmod(self.cell_of[cell_label], self.n_cols)
+
+
+    def mask(self, cell_labels):
+        """
+        Bit mask of the given cells (a label or an iterable of labels).
+        """
+        if isinstance(cell_labels, (int, np.integer, str)):
+            cell_labels = [cell_labels]
+        return sum(1 << self.cell_of[cell_label] for cell_label in set(cell_labels))
+
+
+    def space(self, holes=()):
+        """
+        The board as a list of rows in the style of the puzzle scripts -- 'B' / 'W' / 0 and -1 for no cell.
+        """
+        symbols = {NO_CELL: -1, PLAIN: 0, BLACK: 'B', WHITE: 'W'}
+        space = [[symbols[code] for code in row] for row in self.grid.tolist()]
+        for cell_label in ([holes] if isinstance(holes, (int, np.integer, str)) else holes):
+            x, y = self.xy(cell_label)
+            space[x][y] = -1
+        return space
+
+
+    def placements(self, orientations):
+        """
+        Every placement of a piece given by its orientations, as (bit mask, labels of the cells filled).
+        The top left corner of the orientation goes on every square of the grid in order and the
+        orientations are tried in the order given at every square; duplicates are dropped.
+        """
+        orientations = {piece_codes(orientation).tobytes() + bytes(np.shape(orientation)): piece_codes(orientation) for orientation in orientations}
+        if len({int(np.count_nonzero(codes)) for codes in orientations.values()}) > 1:
+            raise ValueError('Every orientation of a piece should have the same number of cells')
+        anchor_x, anchor_y = np.divmod(np.arange(self.grid.size), self.n_cols)
+
+        anchors, orientation_inds, cells = [], [], []  # Placements found with every orientation
+        for orientation_ind, codes in enumerate(orientations.values()):
+            di, dj = np.nonzero(codes)
+            height, width = codes.shape
+
+            # Every anchor where the orientation stays inside the grid, then only those on matching cells
+            inside = np.flatnonzero((anchor_x + height <= self.n_rows) & (anchor_y + width <= self.n_cols))
+            x, y = anchor_x[inside, None] + di, anchor_y[inside, None] + dj
+            board_codes = self.grid[x, y]
+            fits = ((board_codes != NO_CELL) & ((codes[di, dj] == PLAIN) | (board_codes == codes[di, dj]))).all(axis=1)
+
+            anchors.append(inside[fits])
+            orientation_inds.append(np.full(fits.sum(), orientation_ind))
+            cells.append((x * self.n_cols + y)[fits])
+
+        if not cells:
+            return []
+        order = np.lexsort((np.concatenate(orientation_inds), np.concatenate(anchors)))
+
+        placements = []
+        for cell_row in np.concatenate(cells)[order].tolist():
+            placements.append((sum(1 << cell for cell in cell_row), [self.labels[cell] for cell in cell_row]))
+        return placements
+
+
+    def placement_table(self, orientation_sets, hole_sets=()):
+        """
+        PlacementTable of the pieces (given by their lists of orientations), iterating over hole_sets.
+        """
+        return PlacementTable(self, [self.placements(orientations) for orientations in orientation_sets], hole_sets)
+
+
+    def create_main_dict(self, orientation_sets, hole_sets):
+        """
+        The placements of every piece (given by its list of orientations) for every set of holes, as
+        {holes: {piece number: [cells filled, ...]}} -- placement_table with every list built.
+        """
+        table = self.placement_table(orientation_sets, hole_sets)
+        return {
+            holes: {piece_number: [list(cells_filled) for cells_filled in placements] for piece_number, placements in my_dict.items()}
+            for holes, my_dict in table.items()
+        }
+
+
+    def write_main_dict(self, path, orientation_sets, hole_sets):
+        """
+        Writes the table of create_main_dict into a placements file (exact_cover.storage) without ever
+        holding all of it: every set of holes is filtered in-process (one vectorized AND) and its
+        table written straight away.
+        """
+        with PlacementsWriter(path) as writer:
+            for holes, my_dict in self.placement_table(orientation_sets, hole_sets).items():
+                writer.write(holes, my_dict)
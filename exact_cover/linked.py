@@ -0,0 +1,434 @@
+from .base import ExactCover
+
+
+class Node:
+    def __init__(self):
+        self.left = self
+        self.right = self
+        self.up = self
+        self.down = self
+
+        self.column = None
+        self.row = None
+
+        self.coord = None
+
+
+class ColumnHeader(Node):
+    def __init__(self, name=None, index=None):
+        super().__init__()
+        self.size = 0  # Number of nodes in the item
+        self.name = name  # Column identifying name
+        self.index = index  # Column number in the matrix
+        self.column = self
+
+    def __str__(self):
+        return f'{self.name} - {id(self)}'
+
+
+class DancingLinks(ExactCover):
+    """
+    Dancing Links with one Node object per nonzero entry.
+    """
+    def _link(self, rows, cols, n_cols):
+
+        # First node of every row, used to pre-cover rows
+        self.first_row_nodes = [None] * self.n_rows
+
+        self.h = ColumnHeader("h")
+        previous_column_nodes = []
+
+        # Create all column headers, only primary columns are linked into the header list
+        previous_column_header = self.h
+        for i in range(n_cols):
+            column_header = ColumnHeader(f'Item {i}', i)
+            previous_column_nodes.append(column_header)
+            if not self.primary[i]: # Secondary columns stay linked to themselves
+                continue
+
+            previous_column_header.right = column_header # Link the previous column header to the current one
+            column_header.left = previous_column_header # Link the current column header to the previous one
+            previous_column_header = column_header
+
+        previous_column_header.right = self.h # Link the last column header to the head
+        self.h.left = previous_column_header # Link the head to the last column header
+        self.column_headers = column_headers = list(previous_column_nodes)
+
+
+        # Create the nodes, only visiting the nonzero entries
+        previous_row_node = None
+        first_row_node = None
+        previous_row_ind = None
+
+        for row_ind, ind in zip(rows.tolist(), cols.tolist()):
+            if row_ind != previous_row_ind:
+                if previous_row_node is not None:
+                    previous_row_node.right = first_row_node # Link first row node to last row node
+                    first_row_node.left = previous_row_node # Link last row node to first row node
+
+                previous_row_node = None
+                first_row_node = None
+                previous_row_ind = row_ind
+
+            node = Node()
+            node.coord = (row_ind, ind)
+            column_header = column_headers[ind] # Find column header
+
+            node.column = column_header
+            column_header.size += 1
+
+            # Remember the first node in the row
+            if first_row_node is None:
+                first_row_node = node
+                self.first_row_nodes[row_ind] = node
+
+            # Connect node with previous node in row
+            if previous_row_node is not None:
+                previous_row_node.right = node
+                node.left = previous_row_node
+            previous_row_node = node
+
+            # Connect node with previous node in column
+            previous_column_nodes[ind].down = node
+            node.up = previous_column_nodes[ind]
+            previous_column_nodes[ind] = node
+
+        if previous_row_node is not None:
+            previous_row_node.right = first_row_node
+            first_row_node.left = previous_row_node
+
+
+        # Loop the columns
+        for col_num, column_header in enumerate(column_headers):
+            previous_column_nodes[col_num].down = column_header
+            column_header.up = previous_column_nodes[col_num]
+
+
+    def cover(self, column_header: ColumnHeader):
+        # Cover the column_header header
+        column_header.right.left = column_header.left
+        column_header.left.right = column_header.right
+
+        # Cover all options in this column (for this item)
+        updates = 1
+        current_node = column_header.down
+        while current_node != column_header:
+
+            # Cover this option
+            row_node = current_node.right
+            while row_node != current_node:
+                row_node.column.size -= 1
+                row_node.up.down = row_node.down
+                row_node.down.up = row_node.up
+                row_node = row_node.right
+                updates += 1
+
+            current_node = current_node.down
+
+        level = len(self.solution)
+        self.level_covers[level] += 1
+        self.level_updates[level] += updates
+
+
+    def uncover(self, column_header: ColumnHeader):
+        # Uncover all options in this column (for this item)
+        current_node = column_header.up
+        while current_node != column_header:
+
+            # Uncover this option
+            row_node = current_node.left
+            while row_node != current_node:
+                row_node.up.down = row_node
+                row_node.down.up = row_node
+                row_node.column.size += 1
+                row_node = row_node.left
+
+            current_node = current_node.up
+
+        # Uncover the column_header
+        column_header.left.right = column_header
+        column_header.right.left = column_header
+
+    
+    def choose_column(self):
+        if self.heuristic == 'first':
+            return self.h.right
+        if self.heuristic != 'mrv':
+            return self.choose_column_tied()
+
+        chosen_column = self.h.right
+
+        current_column_header = self.h.right.right
+        while current_column_header != self.h:
+
+            # Check if this column has lesser nodes
+            if current_column_header.size < chosen_column.size:
+                chosen_column = current_column_header
+
+            current_column_header = current_column_header.right
+
+        return chosen_column
+
+
+    def choose_column_tied(self):
+        # Collect every column with the fewest nodes and let the heuristic pick one
+        tied = []
+        min_size = None
+
+        current_column_header = self.h.right
+        while current_column_header != self.h:
+            if min_size is None or current_column_header.size < min_size:
+                tied = [current_column_header.index]
+                min_size = current_column_header.size
+            elif current_column_header.size == min_size:
+                tied.append(current_column_header.index)
+
+            current_column_header = current_column_header.right
+
+        return self.column_headers[self.break_tie(tied)]
+    
+
+    def cover_row(self, node: Node):
+        # Covering all items / columns that have been fulfilled by the option containing node
+        self.level_nodes[len(self.solution)] += 1
+        row_node = node.right
+        while row_node != node:
+            self.cover(row_node.column)
+            row_node = row_node.right
+
+
+    def uncover_row(self, node: Node):
+        row_node = node.left
+        while row_node != node:
+            self.uncover(row_node.column)
+            row_node = row_node.left
+
+
+    def is_solved(self):
+        return self.h.right == self.h
+
+
+    def branch_column(self):
+        chosen_column = self.choose_column()
+        self.cover(chosen_column)
+
+        options = []
+        current_node = chosen_column.down
+        while current_node != chosen_column:
+            options.append(current_node)
+            current_node = current_node.down
+
+        return chosen_column, options
+
+
+    def choose_option(self, node: Node):
+        self.solution.append(node)
+        self.cover_row(node)
+
+
+    def unchoose_option(self, node: Node):
+        self.solution.pop()
+        self.uncover_row(node)
+
+
+    def release_column(self, column_header: ColumnHeader):
+        self.uncover(column_header)
+
+
+    def exclude_columns(self, columns):
+        for col_ind in columns:
+            self.cover(self.column_headers[col_ind])
+
+
+    def include_columns(self, columns):
+        for col_ind in reversed(columns):
+            self.uncover(self.column_headers[col_ind])
+
+
+    def unwind(self, depth=0):
+        while len(self.solution) > depth:
+            node = self.solution.pop()
+            self.uncover_row(node)
+            self.uncover(node.column)
+
+
+    def hide_row(self, row_ind):
+        row_node = self.first_row_nodes[row_ind]
+        node = row_node
+        while True:
+            node.up.down = node.down
+            node.down.up = node.up
+            node.column.size -= 1
+            node = node.right
+            if node == row_node:
+                break
+
+
+    def unhide_row(self, row_ind):
+        row_node = self.first_row_nodes[row_ind].left
+        node = row_node
+        while True:
+            node.up.down = node
+            node.down.up = node
+            node.column.size += 1
+            node = node.left
+            if node == row_node:
+                break
+
+
+    def append_row(self, columns):
+        row_ind = len(self.first_row_nodes)
+        first_row_node = None
+
+        for ind in columns:
+            node = Node()
+            node.coord = (row_ind, ind)
+            column_header = self.column_headers[ind]
+            node.column = column_header
+
+            # At the bottom of the column
+            node.up, node.down = column_header.up, column_header
+            column_header.up.down = node
+            column_header.up = node
+            column_header.size += 1
+
+            # At the end of the row
+            if first_row_node is None:
+                first_row_node = node
+            else:
+                node.left, node.right = first_row_node.left, first_row_node
+                first_row_node.left.right = node
+                first_row_node.left = node
+
+        self.first_row_nodes.append(first_row_node)
+        return row_ind
+
+
+    def pop_row(self):
+        if self.first_row_nodes[-1] is not None:
+            self.hide_row(len(self.first_row_nodes) - 1)
+        self.first_row_nodes.pop()
+
+
+    def get_state(self):
+        """
+        The choice stack as a list of (row, column) pairs, safe to pickle / dump as JSON.
+        """
+        return [node.coord for node in self.solution]
+
+
+    def restore_state(self, state):
+        """
+        Replays a choice stack from get_state() on a freshly built instance.
+        """
+        for row_ind, col_ind in state:
+            column_header = self.column_headers[col_ind]
+            self.cover(column_header)
+
+            node = column_header.down
+            while node != column_header and node.coord[0] != row_ind:
+                node = node.down
+            if node == column_header:
+                raise ValueError(f'Row {row_ind} is not available in column {col_ind}')
+
+            self.solution.append(node)
+            self.cover_row(node)
+
+
+    def cover_pre_solution(self, pre_solution):
+        """
+        Puts the given rows into the partial solution and covers all of their items / columns.
+        Returns False without covering anything if a row is empty or two rows share a column, also
+        with a row already in the partial solution.
+        """
+        nodes, columns = [], set()
+        for row_node in self.solution:
+            current_node = row_node
+            while True:
+                columns.add(current_node.column)
+                current_node = current_node.right
+                if current_node == row_node:
+                    break
+
+        for row_index in pre_solution:
+            row_node = self.first_row_nodes[row_index] if 0 <= row_index < len(self.first_row_nodes) else None
+            if row_node is None:
+                return False
+            nodes.append(row_node)
+
+            current_node = row_node
+            while True:
+                if current_node.column in columns:
+                    return False
+                columns.add(current_node.column)
+                current_node = current_node.right
+                if current_node == row_node:
+                    break
+
+        for row_node in nodes:
+            self.solution.append(row_node)
+            self.cover(row_node.column)
+            self.cover_row(row_node)
+
+        return True
+
+
+    def get_rows(self):
+        return [node.coord[0] for node in self.solution]
+
+
+    def iter_solutions(self, state=None, pre_solution=None, max_depth=None, with_rows=True):
+        """
+        Yields every solution (list of row indices) lazily, using an explicit choice stack instead of recursion.
+
+        The generator can be paused after any solution and the position saved with get_state().
+        Passing that state (and the same pre_solution) to iter_solutions of a new instance built from
+        the same matrix carries on with the solutions after it.
+
+        pre_solution rows are covered up front and are part of every solution, as are the fixed rows.
+        With max_depth the search stops descending after that many choices and yields the partial
+        solutions instead, this is how parallel_search splits the work.
+        With with_rows=False None is yielded for every solution, for counting.
+        """
+        # Fixed rows stay at the bottom of the stack, anything a previous search left above them goes
+        self.unwind(len(self.fixed))
+        floor = len(self.solution)
+        if pre_solution is not None:
+            if not self.cover_pre_solution(pre_solution):
+                return
+            floor += len(pre_solution)
+
+        if state is not None:
+            self.restore_state(state[floor:])
+        backtrack = state is not None
+
+        while True:
+            if backtrack:
+                if len(self.solution) == floor:
+                    return
+
+                # Current option doesn't work - Backtrack and try the next option for partial solution
+                current_node = self.solution.pop()
+                self.uncover_row(current_node)
+                chosen_column = current_node.column
+                current_node = current_node.down
+
+            # Solution found if there are no items (columns) left
+            elif self.h.right == self.h or len(self.solution) - floor == max_depth:
+                yield self.get_rows() if with_rows else None
+                backtrack = True
+                continue
+
+            else:
+                chosen_column = self.choose_column()
+                self.cover(chosen_column)
+                current_node = chosen_column.down
+
+            if current_node == chosen_column: # No options left in this column
+                self.uncover(chosen_column)
+                backtrack = True
+            else:
+                # Including the option / row containing current_node in partial solution
+                self.solution.append(current_node)
+                self.cover_row(current_node)
+                backtrack = False
@@ -0,0 +1,145 @@
+"""
+Solutions streamed into a JSON-lines file as they are found, and read back without parsing printed text.
+
+Every line is one solution:
+    {"key": <the instance, e.g. a date or a list of holes>, "placements": [[piece number, [cells filled]], ...]}
+
+SolutionIndex keeps the canonical hashes of the tilings already seen in a sorted .npy file, so that
+sweeps repeated with other piece subsets and orders only write the new ones.
+"""
+import hashlib
+import json
+import os
+import numpy as np
+
+
+class SolutionWriter:
+    """
+    Buffers solutions and writes them chunk_size at a time, and the rest on close / leaving the with block.
+    """
+    def __init__(self, path, chunk_size=1024, append=False):
+        self.file = open(path, 'a' if append else 'w')
+        self.chunk_size = chunk_size
+        self.buffer = []
+        self.n_written = 0
+
+
+    def write(self, key, solution):
+        """
+        Adds a solution, given as {piece number: cells filled}.
+        """
+        record = {
+            'key': [int(part) for part in key] if isinstance(key, tuple) else key,
+            'placements': [[int(piece_number), [int(cell) for cell in cells_filled]] for piece_number, cells_filled in solution.items()],
+        }
+        self.buffer.append(json.dumps(record, separators=(',', ':')))
+        self.n_written += 1
+        if len(self.buffer) >= self.chunk_size:
+            self.flush()
+
+
+    def flush(self):
+        if self.buffer:
+            self.file.write('\n'.join(self.buffer) + '\n')
+            self.buffer = []
+        self.file.flush()
+
+
+    def close(self):
+        self.flush()
+        self.file.close()
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def read_solutions(path):
+    """
+    Yields (key, {piece number: cells filled}) for every solution in the file.
+    """
+    with open(path) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            key = tuple(record['key']) if isinstance(record['key'], list) else record['key']
+            yield key, {piece_number: cells_filled for piece_number, cells_filled in record['placements']}
+
+
+def canonical_hash(solution):
+    """
+    64 bit hash of the tiling of a solution ({piece number: cells filled}) -- the sorted cell sets of
+    its pieces, so the same layout hashes the same whatever the piece numbers and their order.
+    """
+    cell_sets = sorted(tuple(sorted(int(cell) for cell in cells_filled)) for cells_filled in solution.values())
+    return int.from_bytes(hashlib.blake2b(repr(cell_sets).encode(), digest_size=8).digest(), 'little')
+
+
+class SolutionIndex:
+    """
+    The hashes of known tilings: a sorted uint64 array read from path (if it exists), looked up by
+    binary search, and the ones added since, merged into the file on save / leaving the with block.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.known = np.load(path, mmap_mode='r') if os.path.exists(path) else np.zeros(0, dtype=np.uint64)
+        self.new = set()
+
+
+    def __contains__(self, solution_hash):
+        if solution_hash in self.new:
+            return True
+        ind = np.searchsorted(self.known, np.uint64(solution_hash))
+        return bool(ind < len(self.known) and self.known[ind] == solution_hash)
+
+
+    def add(self, solution):
+        """
+        Adds the tiling of a solution, returns whether it was new.
+        """
+        solution_hash = canonical_hash(solution)
+        if solution_hash in self:
+            return False
+        self.new.add(solution_hash)
+        return True
+
+
+    def add_file(self, path):
+        """
+        Adds the tilings of every solution in a results file, returns how many were new.
+        """
+        return sum(self.add(solution) for key, solution in read_solutions(path))
+
+
+    def __len__(self):
+        return len(self.known) + len(self.new)
+
+
+    def save(self):
+        merged = np.union1d(self.known, np.fromiter(self.new, dtype=np.uint64, count=len(self.new)))
+        with open(self.path + '.tmp', 'wb') as f:
+            np.save(f, merged)
+        self.known = np.zeros(0, dtype=np.uint64)  # Let go of the map before replacing the file
+        os.replace(self.path + '.tmp', self.path)
+        self.known, self.new = np.load(self.path, mmap_mode='r'), set()
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.save()
+
+
+def count_distinct(path):
+    """
+    (solutions, distinct tilings) of a results file.
+    """
+    hashes = [canonical_hash(solution) for key, solution in read_solutions(path)]
+    return len(hashes), len(set(hashes))
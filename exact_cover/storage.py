@@ -0,0 +1,278 @@
+"""
+Versioned on-disk format for exact cover matrices and placement tables -- python -m exact_cover.storage file.pickle
+
+A file holds an 8 byte magic, the version and the header length (little-endian uint32), a JSON
+header and then int32 blocks, each starting on a multiple of 8 bytes:
+
+    indptr  -- n_rows + 1 offsets into indices (CSR)
+    indices -- the column of every nonzero entry, row by row
+    labels  -- optional, n_rows x n_labels ints (e.g. the date and piece number of a placement)
+
+The blocks are memory-mapped on loading, so nothing is unpickled and the solvers build straight
+from them (ExactCover.from_file / from_csr).
+"""
+import json
+import pickle
+from collections.abc import Mapping
+import shutil
+import sys
+import tempfile
+import numpy as np
+
+
+MAGIC = b'EXCOVER\x00'
+VERSION = 1
+SUFFIX = '.ecm'
+
+
+class StoredMatrix:
+    """
+    The CSR blocks of a file, memory-mapped (or read with mmap=False), and its header.
+    """
+    def __init__(self, indptr, indices, n_cols, labels=None, meta=None):
+        self.indptr = indptr
+        self.indices = indices
+        self.n_cols = n_cols
+        self.labels = labels
+        self.meta = meta or dict()
+
+
+    @property
+    def n_rows(self):
+        return len(self.indptr) - 1
+
+
+    def to_coo(self):
+        rows = np.repeat(np.arange(self.n_rows), np.diff(self.indptr))
+        return rows, np.asarray(self.indices), self.n_cols
+
+
+    def toarray(self):
+        rows, cols, n_cols = self.to_coo()
+        dense = np.zeros((self.n_rows, n_cols), dtype=int)
+        dense[rows, cols] = 1
+        return dense
+
+
+def check_int32(name, block):
+    if block.size and (block.min() < np.iinfo(np.int32).min or block.max() > np.iinfo(np.int32).max):
+        raise ValueError(f'{name} does not fit into int32')
+
+
+def write_file(path, n_cols, meta, blocks):
+    """
+    Writes the header and the blocks, given as {name: (shape, file object / bytes with the int32 data)}.
+    """
+    header = {'n_cols': int(n_cols), 'meta': meta or dict(), 'blocks': dict()}
+    offset = 0
+    for name, (shape, data) in blocks.items():
+        header['blocks'][name] = {'shape': list(shape), 'offset': offset}
+        offset += -(-int(np.prod(shape)) * 4 // 8) * 8
+
+    header_bytes = json.dumps(header).encode()
+    header_bytes += b' ' * (-(len(MAGIC) + 8 + len(header_bytes)) % 8)
+
+    with open(path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(np.array([VERSION, len(header_bytes)], dtype='<u4').tobytes())
+        f.write(header_bytes)
+        for shape, data in blocks.values():
+            if isinstance(data, bytes):
+                f.write(data)
+            else:
+                data.seek(0)
+                shutil.copyfileobj(data, f)
+            f.write(b'\x00' * (-int(np.prod(shape)) * 4 % 8))
+
+
+def save(path, indptr, indices, n_cols, labels=None, meta=None):
+    """
+    Writes CSR index arrays (and labels, one row of ints per row) with a JSON-able meta dict.
+    """
+    arrays = {'indptr': np.asarray(indptr), 'indices': np.asarray(indices)}
+    if labels is not None:
+        arrays['labels'] = np.asarray(labels).reshape(len(arrays['indptr']) - 1, -1)
+
+    for name, block in arrays.items():
+        check_int32(name, block)
+    write_file(path, n_cols, meta, {name: (block.shape, block.astype('<i4').tobytes()) for name, block in arrays.items()})
+
+
+def load(path, mmap=True):
+    """
+    Reads a file written by save, the blocks being read-only memory maps unless mmap=False.
+    """
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f'{path} is not an exact cover matrix file')
+        version, header_length = np.frombuffer(f.read(8), dtype='<u4')
+        if version > VERSION:
+            raise ValueError(f'{path} has version {version}, only up to {VERSION} can be read')
+        header = json.loads(f.read(int(header_length)))
+    start = len(MAGIC) + 8 + int(header_length)
+
+    blocks = dict()
+    for name, block in header['blocks'].items():
+        shape = tuple(block['shape'])
+        if not mmap or not np.prod(shape):  # Empty blocks can't be mapped
+            with open(path, 'rb') as f:
+                f.seek(start + block['offset'])
+                blocks[name] = np.fromfile(f, dtype='<i4', count=int(np.prod(shape))).reshape(shape)
+        else:
+            blocks[name] = np.memmap(path, dtype='<i4', mode='r', offset=start + block['offset'], shape=shape)
+
+    return StoredMatrix(blocks['indptr'], blocks['indices'], header['n_cols'], blocks.get('labels'), header['meta'])
+
+
+def save_matrix(path, matrix, labels=None, meta=None):
+    """
+    Writes a 0/1 matrix (dense or scipy.sparse).
+    """
+    if hasattr(matrix, 'tocsr'):  # scipy.sparse
+        csr = matrix.tocsr()
+        csr.eliminate_zeros()
+        csr.sort_indices()
+        indptr, indices, n_cols = csr.indptr, csr.indices, csr.shape[1]
+    else:
+        matrix = np.asarray(matrix)
+        rows, indices = np.nonzero(matrix)
+        indptr = np.concatenate(([0], np.cumsum(np.bincount(rows, minlength=matrix.shape[0]))))
+        n_cols = matrix.shape[1]
+
+    save(path, indptr, indices, n_cols, labels, meta)
+
+
+class PlacementsWriter:
+    """
+    Writes a placement table {key: {piece number: [cells filled, ...]}} one key at a time, as rows of
+    the cells they fill labelled with their key (an int or a tuple of ints) and piece number.
+    Only the row offsets are kept in memory; the rows of every key are indexed in the header, so that
+    load_placements can read single keys.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.indices_file, self.labels_file = tempfile.TemporaryFile(), tempfile.TemporaryFile()
+        self.indptr = [0]
+        self.keys, self.key_rows, self.pieces = [], [], set()
+        self.n_cols, self.n_labels = 0, None
+
+
+    def write(self, key, my_dict):
+        key_parts = list(key) if isinstance(key, tuple) else [key]
+        if self.n_labels is None:
+            self.n_labels = len(key_parts) + 1
+        elif len(key_parts) + 1 != self.n_labels:
+            raise ValueError(f'Key {key} does not have the length of the previous keys')
+
+        start = len(self.indptr) - 1
+        indices, labels = [], []
+        for piece_number, placements_of_piece in my_dict.items():
+            self.pieces.add(piece_number)
+            for cells_filled in placements_of_piece:
+                indices.extend(cells_filled)
+                self.indptr.append(self.indptr[-1] + len(cells_filled))
+                labels.append(key_parts + [piece_number])
+
+        indices, labels = np.array(indices, dtype=np.int64), np.array(labels, dtype=np.int64)
+        check_int32('indices', indices)
+        check_int32('labels', labels)
+        self.indices_file.write(indices.astype('<i4').tobytes())
+        self.labels_file.write(labels.astype('<i4').tobytes())
+
+        self.keys.append(key_parts if isinstance(key, tuple) else key)
+        self.key_rows.append([start, len(self.indptr) - 1])
+        self.n_cols = max(self.n_cols, int(indices.max()) + 1 if indices.size else 0)
+
+
+    def close(self):
+        n_rows = len(self.indptr) - 1
+        meta = {'kind': 'placements', 'keys': self.keys, 'key_rows': self.key_rows, 'pieces': sorted(self.pieces)}
+        write_file(self.path, self.n_cols, meta, {
+            'indptr': ((n_rows + 1,), np.array(self.indptr, dtype='<i4').tobytes()),
+            'indices': ((self.indptr[-1],), self.indices_file),
+            'labels': ((n_rows, self.n_labels or 1), self.labels_file),
+        })
+        self.indices_file.close()
+        self.labels_file.close()
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:  # Nothing is written
+            self.indices_file.close()
+            self.labels_file.close()
+
+
+def save_placements(path, placements):
+    """
+    Writes a placement table {key: {piece number: [cells filled, ...]}} -- main_dict and friends.
+    """
+    with PlacementsWriter(path) as writer:
+        for key, my_dict in placements.items():
+            writer.write(key, my_dict)
+
+
+class PlacementsFile(Mapping):
+    """
+    A placements file opened once: the header is parsed and the blocks memory-mapped, so looking up
+    a key only slices its rows. file[key] -> {piece number: [cells filled, ...]}.
+    """
+    def __init__(self, path):
+        self.stored = load(path)
+        self.keys_ = [tuple(key) if isinstance(key, list) else key for key in self.stored.meta['keys']]
+        self.key_rows = dict(zip(self.keys_, self.stored.meta['key_rows']))
+        self.pieces = self.stored.meta['pieces']
+
+
+    def __getitem__(self, key):
+        start, stop = self.key_rows[key]
+        indptr = self.stored.indptr[start:stop + 1].tolist()
+        indices = self.stored.indices[indptr[0]:indptr[-1]].tolist()
+        piece_numbers = self.stored.labels[start:stop, -1].tolist()
+
+        my_dict = {piece_number: [] for piece_number in self.pieces}
+        for row_ind, piece_number in enumerate(piece_numbers):
+            my_dict[piece_number].append(indices[indptr[row_ind] - indptr[0]:indptr[row_ind + 1] - indptr[0]])
+        return my_dict
+
+
+    def __iter__(self):
+        return iter(self.keys_)
+
+
+    def __len__(self):
+        return len(self.keys_)
+
+
+def load_placements(path, keys=None):
+    """
+    Reads a table written by save_placements / PlacementsWriter back into {key: {piece number: [cells filled, ...]}},
+    only with the given keys if any.
+    """
+    placements_file = PlacementsFile(path)
+    return {key: placements_file[key] for key in (placements_file if keys is None else keys)}
+
+
+def convert(path):
+    """
+    Converts a pickled matrix or placement table into the same name with the .ecm suffix.
+    """
+    with open(path, 'rb') as f:
+        obj = pickle.load(f)
+
+    out = path.rsplit('.', 1)[0] + SUFFIX
+    if isinstance(obj, dict):
+        save_placements(out, obj)
+    else:
+        save_matrix(out, obj)
+    return out
+
+
+if __name__ == '__main__':
+    for path in sys.argv[1:]:
+        print(f'{path} -> {convert(path)}')
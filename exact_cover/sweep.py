@@ -0,0 +1,123 @@
+"""
+Long sweeps over many small instances (a set of holes and a piece combination, ...) that survive
+being stopped: every finished unit of work is appended to a journal file, and running the sweep
+again with the same journal only solves the units it doesn't hold yet.
+
+The journal is JSON lines, one per unit:
+    {"unit": <the unit, e.g. [date, [piece numbers]]>, "result": <what the solver returned for it>}
+"""
+import datetime
+import functools
+import json
+import multiprocessing
+import os
+import time
+
+
+def as_unit(value):
+    """
+    A unit read back from JSON, its lists turned into (hashable) tuples.
+    """
+    return tuple(as_unit(part) for part in value) if isinstance(value, list) else value
+
+
+def read_journal(path):
+    """
+    {unit: result} of every unit finished in the journal; a line cut short by a crash is ignored.
+    """
+    done = dict()
+    if not os.path.exists(path):
+        return done
+
+    with open(path) as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            done[as_unit(record['unit'])] = record['result']
+    return done
+
+
+class Journal:
+    """
+    The units finished so far (done), appended to as more are, every line flushed as it is written.
+    """
+    def __init__(self, path):
+        self.done = read_journal(path)
+
+        # Starts on a new line if the last one was cut short
+        needs_newline = False
+        if os.path.exists(path) and os.path.getsize(path):
+            with open(path, 'rb') as f:
+                f.seek(-1, os.SEEK_END)
+                needs_newline = f.read(1) != b'\n'
+        self.file = open(path, 'a')
+        if needs_newline:
+            self.file.write('\n')
+
+
+    def record(self, unit, result):
+        self.file.write(json.dumps({'unit': unit, 'result': result}, separators=(',', ':')) + '\n')
+        self.file.flush()
+        self.done[as_unit(unit)] = result
+
+
+    def close(self):
+        self.file.close()
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def format_duration(seconds):
+    return str(datetime.timedelta(seconds=round(seconds)))
+
+
+def _solve_chunk(solve_chunk, chunk):
+    """
+    The chunk along with its results, which come back out of order.
+    """
+    return chunk, solve_chunk(chunk)
+
+
+def run_sweep(units, solve_chunk, journal_path, processes=None, initializer=None, initargs=(), chunk_size=16, report_every=10.0):
+    """
+    Solves every unit not yet in the journal in a pool of processes (one per core by default), and
+    returns {unit: result} for all of them. solve_chunk (a module level function, run in the workers
+    after initializer(*initargs)) takes a list of units and returns their results, JSON-able.
+    Progress, throughput and the time left are printed every report_every seconds.
+    """
+    units = [as_unit(unit) for unit in units]
+    with Journal(journal_path) as journal:
+        pending = [unit for unit in units if unit not in journal.done]
+        print(f'{len(units) - len(pending)} / {len(units)} units already in {journal_path}, {len(pending)} to go')
+        if not pending:
+            return {unit: journal.done[unit] for unit in units}
+
+        chunks = [pending[i:i + chunk_size] for i in range(0, len(pending), chunk_size)]
+        start = last_report = time.perf_counter()
+        n_solved = 0
+        with multiprocessing.Pool(processes, initializer, initargs) as pool:
+            # Every chunk is journalled as soon as it is done, whichever chunks are still running
+            for chunk, results in pool.imap_unordered(functools.partial(_solve_chunk, solve_chunk), chunks):
+                for unit, result in zip(chunk, results):
+                    journal.record(unit, result)
+                n_solved += len(chunk)
+
+                now = time.perf_counter()
+                if now - last_report >= report_every or n_solved == len(pending):
+                    last_report = now
+                    rate = n_solved / (now - start)
+                    print(
+                        f'{len(units) - len(pending) + n_solved} / {len(units)} units, {rate:.1f} units/s, '
+                        f'{format_duration(now - start)} elapsed, ETA {format_duration((len(pending) - n_solved) / rate)}',
+                        flush=True,
+                    )
+
+        return {unit: journal.done[unit] for unit in units}
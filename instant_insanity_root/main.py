@@ -1,4 +1,4 @@
-from dlx import DancingLinks
+from exact_cover import solver
 import numpy as np
 
 
@@ -158,9 +158,20 @@ m = np.unique(m, axis=0)
 print(f'Shape after: {m.shape}')
 
 
-dl = DancingLinks(m)
-dl.search(multi_solution_flag=True)
-print(f'Number of solutions / 4: {dl.no_of_solutions / 4}')
+def quarter_turn():
+    """
+    Column permutation for turning the whole tower by 90 degrees - every side goes to the next one (west -> south -> east -> north).
+    """
+    perm = list(range(4))  # Cube identifiers stay
+    for set_of_4_ind in range(len(Cube.TOTAL_COLORS)):
+        perm.extend(4 + set_of_4_ind*4 + (side + 1) % 4 for side in range(4))
+    return perm
+
+
+# Every solution turned by 90 degrees is also a solution, only count one per turn
+dl = solver(m, backend='bitset', symmetries=[quarter_turn()])
+dl.count_solutions()
+print(f'Number of solutions: {dl.no_of_solutions}')
 
 
 
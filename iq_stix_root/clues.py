@@ -0,0 +1,91 @@
+"""
+Clue sets for IQ Stix puzzles with exactly one solution -- python clues.py [number of puzzles] [seed]
+
+A clue is what main() asks for: a piece restriction (a letter for a row, a number for a column)
+and the row / column it fills. For a solution, minimal_clues drops clues one by one as long as
+the rest still leave only that solution, and fewest_clues tries every set of clues from the
+smallest up; both only ever count up to 2 solutions.
+"""
+import itertools
+import sys
+import time
+import numpy as np
+from string import ascii_uppercase as au
+
+from exact_cover import BitsetExactCover
+from main import load_big_mtx, piece_list
+
+
+def distinct_rows(M):
+    """
+    Indices of the first copy of every row of M -- a piece that reads the same flipped is placed
+    twice, which would count every solution with it twice.
+    """
+    return np.sort(np.unique(M, axis=0, return_index=True)[1])
+
+
+def clue_of(mtx_row):
+    """
+    (piece restriction, row / column number) of a row of the big matrix, as entered in main().
+    """
+    piece_number = int(np.argmax(mtx_row[:10]))
+    mtx = mtx_row[20:].reshape(5, 5)
+
+    if mtx_row[10:15].any():
+        row_index = int(np.argmax(mtx_row[10:15]))
+        flipped_flag = not (mtx[row_index] == piece_list[piece_number]).all()
+        return au[2 * piece_number + flipped_flag], row_index + 1
+
+    col_index = int(np.argmax(mtx_row[15:20]))
+    flipped_flag = not (mtx[:, col_index] == piece_list[piece_number]).all()
+    return str(2 * piece_number + flipped_flag + 1), col_index + 1
+
+
+def minimal_clues(dl, solution):
+    """
+    A set of rows of the solution that only it contains, none of which can be left out.
+    """
+    clues = sorted(solution)
+    for row_ind in sorted(solution):
+        fewer = [clue for clue in clues if clue != row_ind]
+        if dl.is_unique(pre_solution=fewer):
+            clues = fewer
+    return clues
+
+
+def fewest_clues(dl, solution, max_clues=None):
+    """
+    A smallest set of rows of the solution that only it contains, None if it needs more than max_clues.
+    """
+    for n_clues in range(min(len(solution), max_clues or len(solution)) + 1):
+        for clues in itertools.combinations(sorted(solution), n_clues):
+            if dl.is_unique(pre_solution=list(clues)):
+                return list(clues)
+    return None
+
+
+def main(n_puzzles=5, seed=0):
+    M = load_big_mtx()
+    rows = distinct_rows(M)
+    dl = BitsetExactCover(M[rows])
+
+    solutions = list(dl.iter_solutions())
+    print(f'{len(solutions)} solutions\n')
+
+    rng = np.random.default_rng(seed)
+    for solution_ind in rng.choice(len(solutions), n_puzzles, replace=False):
+        solution = solutions[solution_ind]
+
+        start = time.perf_counter()
+        clues = minimal_clues(dl, solution)
+        fewest = fewest_clues(dl, solution, max_clues=len(clues))
+        elapsed = time.perf_counter() - start
+
+        print(f'Solution {solution_ind}: {len(clues)} clues without any to spare, {len(fewest)} at fewest ({elapsed * 1000:.0f} ms)')
+        for restriction, number in (clue_of(M[rows[row_ind]]) for row_ind in fewest):
+            print(f'    {restriction} in {"row" if restriction in au else "column"} {number}')
+        print()
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:3]))
@@ -1,5 +1,6 @@
 import numpy as np
 import pickle
+from exact_cover.storage import save_matrix
 
 
 piece_list = np.array([ # AS ROWS   
@@ -68,6 +69,7 @@ def save_mtx():
     M = np.concatenate(out, axis=0)
     with open('M.pkl', 'wb') as f:
         pickle.dump(M, f)
+    save_matrix('M.ecm', M)
 
 
 if __name__ == '__main__':
@@ -1,12 +1,11 @@
-import pickle
-from dlx import DancingLinks
+from exact_cover import DancingLinks
+from exact_cover.storage import load
 import numpy as np
 from string import ascii_uppercase as au
 
 
 def load_big_mtx():
-    with open("big_mtx.pkl", "rb") as f:
-        return pickle.load(f)
+    return load("big_mtx.ecm").toarray()
 
 
 
@@ -69,20 +68,26 @@ def create_restriction(big_m, restriction, number):
 def main():
     M = load_big_mtx()
 
-    pre_solution = []
+    # Built once, every clue is fixed on the live structure
+    dl = DancingLinks(M)
     while True:
-        input_piece = input('Enter piece number / "solve": ')
+        input_piece = input('Enter piece number / "undo" / "solve": ')
         if input_piece == "solve":
             print('\n')
             break
 
+        if input_piece == "undo":
+            if dl.history:
+                dl.undo()
+            continue
+
         input_row_col = int(input('Enter row / col number: '))
         assert 1 <= input_row_col <= 5, "Row / Col number should be between 1 and 5"
-        pre_solution.append(create_restriction(M, input_piece, input_row_col))
+        if not dl.fix_row(create_restriction(M, input_piece, input_row_col)):
+            print('This clue clashes with an earlier one')
 
 
-    dl = DancingLinks(M)
-    sol = dl.solve(pre_solution=pre_solution)
+    sol = dl.solve()
 
     if not sol:
         print("No solution found")
@@ -0,0 +1,88 @@
+from exact_cover import DancingLinks, ArrayDancingLinks, BitsetExactCover
+import main
+import functools
+import itertools
+import time
+import tracemalloc
+
+
+def workloads():
+    """
+    The matrices the puzzle scripts solve, built by their own create_matrix:
+    main_dict.ecm -- every date with every 6 / 8 pentomino combination (main.py)
+
+    mini.py's matrices are left out: some of its cells are filled by no placement of its 8
+    pentominos, so every search stops before its first choice and there is nothing to measure.
+    """
+    yield 'main_dict.ecm', [
+        main.create_matrix(combination, date)
+        for date in main.main_dict
+        for combination in itertools.combinations(range(8), 6)
+    ]
+
+
+def run(dlx_class, matrices):
+    """
+    Build time, memory and search time of dlx_class over the matrices, along with its solutions.
+    tracemalloc slows down every allocation, so the memory is measured on a second, traced build.
+    """
+    start = time.perf_counter()
+    dls = [dlx_class(mtx) for mtx in matrices]
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for dl in dls:
+        dl.search(multi_solution_flag=True)
+    search_time = time.perf_counter() - start
+
+    all_solutions = [dl.all_solutions for dl in dls]
+    del dls
+
+    tracemalloc.start()
+    dls = [dlx_class(mtx) for mtx in matrices]
+    build_memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    return build_time, build_memory, search_time, all_solutions
+
+
+def run_heuristic(heuristic, matrices):
+    """
+    Search time and the summed search counters of ArrayDancingLinks with the given heuristic.
+    """
+    dls = [ArrayDancingLinks(mtx, heuristic=heuristic, seed=0) for mtx in matrices]
+
+    start = time.perf_counter()
+    nodes = updates = 0
+    for dl in dls:
+        dl.search(multi_solution_flag=True)
+        nodes += dl.stats['nodes']
+        updates += dl.stats['updates']
+
+    return time.perf_counter() - start, nodes, updates
+
+
+if __name__ == '__main__':
+    for name, matrices in workloads():
+        print(f'{name} -- {len(matrices)} matrices, {sum(mtx.sum() for mtx in matrices)} nodes')
+
+        results = dict()
+        for label, dlx_class in [
+            ('DancingLinks', DancingLinks),
+            ('ArrayDancingLinks', ArrayDancingLinks),
+            ('ArrayDancingLinks compact', functools.partial(ArrayDancingLinks, compact=True)),
+            ('BitsetExactCover', BitsetExactCover),
+        ]:
+            build_time, build_memory, search_time, all_solutions = run(dlx_class, matrices)
+            results[label] = all_solutions
+            print(
+                f'{label:>25}: build {build_time:7.3f}s {build_memory / 2**20:8.2f} MB, '
+                f'search {search_time:7.3f}s, {sum(map(len, all_solutions))} solutions'
+            )
+
+        assert all(all_solutions == results['DancingLinks'] for all_solutions in results.values()), 'Solutions differ'
+
+        for heuristic in ArrayDancingLinks.HEURISTICS:
+            search_time, nodes, updates = run_heuristic(heuristic, matrices)
+            print(f'{heuristic:>25}: search {search_time:7.3f}s, {nodes} nodes, {updates} updates')
+        print()
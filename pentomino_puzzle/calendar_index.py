@@ -0,0 +1,148 @@
+"""
+Solutions of the full calendar (month, date and weekday holes, framework_full.py) looked up instead of solved.
+
+    python calendar_index.py build [--solutions K] [--processes N]   -- solves every hole triple into calendar_index.ecm
+    python calendar_index.py query [YYYY-MM-DD]                      -- prints a solution for the date (today by default)
+"""
+import argparse
+import datetime
+import itertools
+import multiprocessing
+import time
+import numpy as np
+
+from exact_cover import BitsetExactCover
+from exact_cover.storage import PlacementsFile, PlacementsWriter
+from framework_full import BOARD, generate_orientations, get_all_m_triples, pentomino_set_A
+
+
+INDEX_PATH = 'calendar_index.ecm'
+
+# Seven of the pentominos and the three tetrominos fill the 47 cells left by the holes
+PIECE_NUMBERS = [0, 1, 2, 3, 4, 5, 6, 8, 9, 10]
+
+# Cells of the board as m -- months are -11 (January) to 0, dates 1 to 31 and weekdays 32 (Sunday) to 38
+WEEKDAY_M = {6: 32, 0: 33, 1: 34, 2: 35, 3: 36, 4: 37, 5: 38}  # datetime.weekday() -> m
+
+
+def date_to_m_triple(date):
+    return date.month - 12, date.day, WEEKDAY_M[date.weekday()]
+
+
+def create_solver(table, m_triple, piece_numbers):
+    """
+    Bitset solver for the triple -- a column for every cell (m + 11) and every piece, the holes being
+    secondary columns no placement covers. Also returns (piece number, cells filled) for every row.
+    """
+    rows, cols, row_placements = [], [], []
+    for shift, piece_number in enumerate(piece_numbers):
+        for cells_filled in table[m_triple][piece_number]:
+            rows.extend([len(row_placements)] * (len(cells_filled) + 1))
+            cols.extend([cell + 11 for cell in cells_filled] + [50 + shift])
+            row_placements.append((piece_number, cells_filled))
+
+    dl = BitsetExactCover.from_coo(np.array(rows), np.array(cols), 50 + len(piece_numbers), secondary=[m + 11 for m in m_triple])
+    return dl, row_placements
+
+
+def _init_worker(piece_numbers, n_solutions):
+    global _worker_args
+    table = BOARD.placement_table([generate_orientations(p) for p in pentomino_set_A])
+    _worker_args = table, piece_numbers, n_solutions
+
+
+def _solve_chunk(m_triples):
+    """
+    Up to n_solutions solutions of every triple, as {piece number: [cells filled in every solution]}.
+    """
+    table, piece_numbers, n_solutions = _worker_args
+
+    out = []
+    for m_triple in m_triples:
+        dl, row_placements = create_solver(table, m_triple, piece_numbers)
+        my_dict = {piece_number: [] for piece_number in piece_numbers}
+        for solution in itertools.islice(dl.iter_solutions(), n_solutions):
+            for row_ind in solution:
+                piece_number, cells_filled = row_placements[row_ind]
+                my_dict[piece_number].append(cells_filled)
+        out.append(my_dict)
+
+    return out
+
+
+def build_index(path=INDEX_PATH, n_solutions=1, processes=None, piece_numbers=PIECE_NUMBERS, chunk_size=16):
+    """
+    Solves every hole triple in a pool of processes (one per core by default), writing the solutions
+    into a placements file keyed by triple as the chunks are done.
+    """
+    m_triples = list(get_all_m_triples())
+    chunks = [m_triples[i:i + chunk_size] for i in range(0, len(m_triples), chunk_size)]
+
+    with PlacementsWriter(path) as writer, multiprocessing.Pool(processes, _init_worker, (piece_numbers, n_solutions)) as pool:
+        for chunk, solved in zip(chunks, pool.imap(_solve_chunk, chunks)):
+            for m_triple, my_dict in zip(chunk, solved):
+                writer.write(m_triple, my_dict)
+
+
+class CalendarIndex:
+    """
+    The file written by build_index, opened once; a lookup only slices the rows of its triple.
+    """
+    def __init__(self, path=INDEX_PATH):
+        self.index = PlacementsFile(path)
+
+
+    def solutions(self, m_triple):
+        """
+        Every stored solution of the triple as {piece number: cells filled}, none if it can't be solved.
+        """
+        my_dict = self.index[tuple(m_triple)]
+        n_solutions = min(map(len, my_dict.values()), default=0)
+        return [{piece_number: cells[i] for piece_number, cells in my_dict.items()} for i in range(n_solutions)]
+
+
+    def solve_date(self, date):
+        return self.solutions(date_to_m_triple(date))
+
+
+def print_solution(solution):
+    """
+    The board with every cell showing the letter of the piece filling it, '.' for holes.
+    """
+    letter_of = {cell: chr(ord('A') + ind) for ind, cells_filled in enumerate(solution.values()) for cell in cells_filled}
+    for x in range(BOARD.n_rows):
+        row = ''
+        for y in range(BOARD.n_cols):
+            cell = BOARD.labels.get(x * BOARD.n_cols + y)
+            row += letter_of.get(cell, '.') if BOARD.grid[x, y] else ' '
+        print(row)
+    print()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    build_parser = commands.add_parser('build')
+    build_parser.add_argument('--solutions', type=int, default=1)
+    build_parser.add_argument('--processes', type=int, default=None)
+
+    query_parser = commands.add_parser('query')
+    query_parser.add_argument('date', nargs='?', type=datetime.date.fromisoformat, default=datetime.date.today())
+
+    args = parser.parse_args()
+    if args.command == 'build':
+        start = time.perf_counter()
+        build_index(n_solutions=args.solutions, processes=args.processes)
+        print(f'{INDEX_PATH} built in {time.perf_counter() - start:.1f}s')
+
+    else:
+        calendar_index = CalendarIndex()
+        start = time.perf_counter()
+        solutions = calendar_index.solve_date(args.date)
+        print(f'{args.date} -- holes {date_to_m_triple(args.date)}, looked up in {(time.perf_counter() - start) * 1e6:.0f} µs\n')
+
+        if solutions:
+            print_solution(solutions[0])
+        else:
+            print('No solution')
@@ -1,4 +1,83 @@
-from PIL import Image, ImageDraw, ImageFont
+import multiprocessing
+import numpy as np
+from PIL import Image, ImageColor, ImageDraw, ImageFont
+from exact_cover.results import SolutionWriter, read_solutions
+
+
+def load_font(cell_size):
+    # Try loading a font
+    try:
+        return ImageFont.truetype("/Users/shaumikkhanna/Library/Fonts/Helvetica/Helvetica.ttf", int(cell_size * 0.3))
+    except:
+        print("Unable to load font. Using default.")
+        return ImageFont.load_default()
+
+
+def draw_cell(draw, cell, x1, y1, cell_size, border_thickness, font):
+    """
+    Draws one cell of the grid with its top left corner at (x1, y1).
+    """
+    x2 = x1 + cell_size
+    y2 = y1 + cell_size
+
+    # Draw cell background
+    fill_color = cell.get("fill_color", (255, 255, 255))
+    draw.rectangle([x1, y1, x2, y2], fill=fill_color)
+
+    # Add text to the cell
+    text = cell.get("text", "")
+    text_color = cell.get("text_color", "black")
+    text_bbox = draw.textbbox((0, 0), text, font=font)
+    text_width = text_bbox[2] - text_bbox[0]
+    text_height = text_bbox[3] - text_bbox[1]
+    text_x = x1 + (cell_size - text_width) / 2
+    text_y = y1 + (cell_size - text_height) / 2 - 5
+    draw.text((text_x, text_y), text, fill=text_color, font=font)
+
+    # Draw darkened borders
+    dark_borders = cell.get("dark_borders", [])
+    border_color = "#07155b" # BORDER COLOR
+    if "top" in dark_borders:
+        draw.rectangle([x1, y1, x2, y1 + border_thickness], fill=border_color)
+    if "right" in dark_borders:
+        draw.rectangle([x2 - border_thickness, y1, x2, y2], fill=border_color)
+    if "bottom" in dark_borders:
+        draw.rectangle([x1, y2 - border_thickness, x2, y2], fill=border_color)
+    if "left" in dark_borders:
+        draw.rectangle([x1, y1, x1 + border_thickness, y2], fill=border_color)
+
+
+def blank_image(rows, cols, cell_size, overall_border):
+    """
+    The white canvas with the overall border.
+    """
+    total_width = cols * cell_size + 2 * overall_border
+    total_height = rows * cell_size + 2 * overall_border
+    image = Image.new("RGB", (total_width, total_height), color="white")
+
+    # Add an overall border
+    ImageDraw.Draw(image).rectangle(
+        [0, 0, total_width - 1, total_height - 1],
+        outline="yellow",
+        width=overall_border
+    )
+    return image
+
+
+def render_grid(grid, cell_size=100, border_thickness=4, overall_border=1, font=None):
+    """
+    The image of a grid (see create_grid_image).
+    """
+    image = blank_image(len(grid), len(grid[0]), cell_size, overall_border)
+    draw = ImageDraw.Draw(image)
+    font = font or load_font(cell_size)
+
+    # Draw grid cells
+    for row in range(len(grid)):
+        for col in range(len(grid[0])):
+            draw_cell(draw, grid[row][col], col * cell_size + overall_border, row * cell_size + overall_border, cell_size, border_thickness, font)
+
+    return image
 
 
 def create_grid_image(grid, cell_size=100, border_thickness=4, overall_border=1, output_file="grid.png"):
@@ -15,69 +94,97 @@ def create_grid_image(grid, cell_size=100, border_thickness=4, overall_border=1,
     :param overall_border: Thickness of the border around the entire image.
     :param output_file: Name of the output image file.
     """
-    rows = len(grid)
-    cols = len(grid[0])
+    image = render_grid(grid, cell_size, border_thickness, overall_border)
 
-    # Create the image canvas
-    img_width = cols * cell_size
-    img_height = rows * cell_size
-    total_width = img_width + 2 * overall_border
-    total_height = img_height + 2 * overall_border
-    image = Image.new("RGB", (total_width, total_height), color="white")
-    draw = ImageDraw.Draw(image)
+    # Save the image
+    image.save(output_file)
+    print(f"Grid image saved as {output_file}")
 
-    # Add an overall border
-    draw.rectangle(
-        [0, 0, total_width - 1, total_height - 1],
-        outline="yellow",
-        width=overall_border
-    )
 
-    # Try loading a font
-    try:
-        font = ImageFont.truetype("/Users/shaumikkhanna/Library/Fonts/Helvetica/Helvetica.ttf", int(cell_size * 0.3))
-    except:
-        print("Unable to load font. Using default.")
-        font = ImageFont.load_default()
+class BatchRenderer:
+    """
+    Renders many solution grids like render_grid, but every distinct cell (background, date tile of
+    the hole, set of borders) is drawn once into a tile and the grids are only pasted together from
+    the tiles, in the same order as render_grid draws the cells, so the images are the same.
+    """
+    def __init__(self, cell_size=100, border_thickness=4, overall_border=1):
+        self.cell_size = cell_size
+        self.border_thickness = border_thickness
+        self.overall_border = overall_border
+        self.font = load_font(cell_size)
+        self.tiles = dict()
+        self.blank = None
 
-    # Draw grid cells
-    for row in range(rows):
-        for col in range(cols):
-            cell = grid[row][col]
-            x1 = col * cell_size + overall_border
-            y1 = row * cell_size + overall_border
-            x2 = x1 + cell_size
-            y2 = y1 + cell_size
-
-            # Draw cell background
-            fill_color = cell.get("fill_color", (255, 255, 255))
-            draw.rectangle([x1, y1, x2, y2], fill=fill_color)
-
-            # Add text to the cell
-            text = cell.get("text", "")
-            text_color = cell.get("text_color", "black")
-            text_bbox = draw.textbbox((0, 0), text, font=font)
-            text_width = text_bbox[2] - text_bbox[0]
-            text_height = text_bbox[3] - text_bbox[1]
-            text_x = x1 + (cell_size - text_width) / 2
-            text_y = y1 + (cell_size - text_height) / 2 - 5
-            draw.text((text_x, text_y), text, fill=text_color, font=font)
-
-            # Draw darkened borders
-            dark_borders = cell.get("dark_borders", [])
-            border_color = "#07155b" # BORDER COLOR
-            if "top" in dark_borders:
-                draw.rectangle([x1, y1, x2, y1 + border_thickness], fill=border_color)
-            if "right" in dark_borders:
-                draw.rectangle([x2 - border_thickness, y1, x2, y2], fill=border_color)
-            if "bottom" in dark_borders:
-                draw.rectangle([x1, y2 - border_thickness, x2, y2], fill=border_color)
-            if "left" in dark_borders:
-                draw.rectangle([x1, y1, x1 + border_thickness, y2], fill=border_color)
 
-    # Save the image
-    image.save(output_file)
-    print(f"Grid image saved as {output_file}")
+    def tile(self, cell):
+        key = (cell.get("fill_color"), cell.get("text", ""), cell.get("text_color"), tuple(sorted(set(cell.get("dark_borders", [])))))
+        if key not in self.tiles:
+            # Cells are drawn one pixel past their size, overlapping the next one
+            tile = Image.new("RGB", (self.cell_size + 1, self.cell_size + 1))
+            draw_cell(ImageDraw.Draw(tile), cell, 0, 0, self.cell_size, self.border_thickness, self.font)
+            self.tiles[key] = tile
+        return self.tiles[key]
+
+
+    def render(self, grid):
+        if self.blank is None:
+            self.blank = blank_image(len(grid), len(grid[0]), self.cell_size, self.overall_border)
+
+        image = self.blank.copy()
+        for row in range(len(grid)):
+            for col in range(len(grid[0])):
+                image.paste(self.tile(grid[row][col]), (col * self.cell_size + self.overall_border, row * self.cell_size + self.overall_border))
+        return image
+
+
+    def render_solution(self, solution):
+        return self.render(create_sections(build_grid(piece_mapping_of(solution))))
+
+
+def _init_renderer(cell_size, border_thickness, overall_border):
+    global _renderer
+    _renderer = BatchRenderer(cell_size, border_thickness, overall_border)
+
+
+def _render_and_save(args):
+    output_file, solution = args
+    _renderer.render_solution(solution).save(output_file)
+    return output_file
+
+
+def _render_chunk(solutions):
+    return [_renderer.render_solution(solution) for solution in solutions]
+
+
+def render_batch(solutions, output_dir="final_images", processes=None, cell_size=100, border_thickness=4, overall_border=1):
+    """
+    Renders solutions ({piece number: dates filled}) into output_dir/grid_1.png, ... in a pool of
+    processes (one per core by default), each with its own tiles. Returns the number of images.
+    """
+    jobs = ((f"{output_dir}/grid_{i+1}.png", solution) for i, solution in enumerate(solutions))
+    with multiprocessing.Pool(processes, _init_renderer, (cell_size, border_thickness, overall_border)) as pool:
+        return sum(1 for _ in pool.imap(_render_and_save, jobs, chunksize=16))
+
+
+def render_sheet(solutions, output_file="sheet.png", columns=10, processes=None, cell_size=100, border_thickness=4, overall_border=1, chunk_size=16):
+    """
+    Renders solutions in a pool of processes and saves them side by side, columns per row, as one image.
+    """
+    solutions = list(solutions)
+    chunks = [solutions[i:i + chunk_size] for i in range(0, len(solutions), chunk_size)]
+
+    sheet = None
+    with multiprocessing.Pool(processes, _init_renderer, (cell_size, border_thickness, overall_border)) as pool:
+        images = (image for chunk_images in pool.imap(_render_chunk, chunks) for image in chunk_images)
+        for i, image in enumerate(images):
+            if sheet is None:
+                rows = -(-len(solutions) // columns)
+                sheet = Image.new("RGB", (min(columns, len(solutions)) * image.width, rows * image.height), color="white")
+            sheet.paste(image, ((i % columns) * image.width, (i // columns) * image.height))
+
+    if sheet is not None:
+        sheet.save(output_file)
+    return sheet
 
 
 def process_input(input_):
@@ -93,6 +200,45 @@ def process_input(input_):
     return out
 
 
+def piece_mapping_of(solution):
+    """
+    {date: piece number} for a solution read from a results file, like process_input.
+    """
+    return {cell: piece_number for piece_number, cells_filled in solution.items() for cell in cells_filled}
+
+
+def convert_printed_results(path, out_path):
+    """
+    Converts results printed by main.py (Date = ... headers and Piece number = ... --- lines) into a
+    results file, returns the number of solutions.
+    """
+    with open(path) as f, SolutionWriter(out_path) as sink:
+        date, solution = None, dict()
+        for line in f:
+            if line.startswith('Piece number = '):
+                parts = line.split(' --- ')
+                solution[int(parts[0].split()[-1])] = [int(x) for x in parts[1].split()]
+                continue
+
+            # Any other line ends the solution being read
+            if solution:
+                sink.write(date, solution)
+                solution = dict()
+            if line.startswith('Date = '):
+                date = int(line.split()[-1])
+
+        if solution:
+            sink.write(date, solution)
+        return sink.n_written
+
+
+def draw_results(path, output_dir='final_images', processes=None):
+    """
+    Draws every solution of a results file (main.write_solutions / convert_printed_results).
+    """
+    return render_batch((solution for date, solution in read_solutions(path)), output_dir, processes)
+
+
 def build_grid(piece_mapping):
     grid = []
     for row_number in range(4):
@@ -145,6 +291,144 @@ def create_sections(grid):
     return grid
 
 
+# Fast path -- the grids of build_grid / create_sections as arrays, rendered through a palette
+PALETTE = np.array([ImageColor.getrgb(color) for color in ('white', 'gray', '#07155b', 'yellow')], dtype=np.uint8)
+WHITE, GRAY, DARK, YELLOW = range(len(PALETTE))
+
+
+def solution_arrays(solutions):
+    """
+    For solutions ({piece number: dates filled}), the cell values of build_grid (piece number, 0 for
+    the hole and -1 off the board) as an (n, 5, 7) array, the fill colours as palette indices and the
+    dark borders of create_sections as an (n, 5, 7, 4) bool array -- top, right, bottom, left.
+    """
+    values = np.zeros((len(solutions), 5, 7), dtype=int)
+    values[:, 4, :4] = -1
+    holes = np.ones((len(solutions), 5, 7), dtype=bool)
+    holes[:, 4, :4] = False
+    for i, solution in enumerate(solutions):
+        for piece_number, cells_filled in solution.items():
+            for date in cells_filled:
+                row, col = divmod(date - 1, 7)
+                if row == 4:
+                    col = col + 4
+                values[i, row, col] = piece_number
+                holes[i, row, col] = False
+
+    row, col = np.indices((5, 7))
+    fills = np.where((7 * row + col + 1) % 2 == 0, WHITE, GRAY)
+    fills[4, :4] = DARK
+    fills = np.where(holes, DARK, fills).astype(np.uint8)
+
+    # A border between any two neighbouring cells with different values, and around the holes
+    borders = np.zeros((len(solutions), 5, 7, 4), dtype=bool)
+    across = values[:, :, :-1] != values[:, :, 1:]
+    borders[:, :, :-1, 1] |= across
+    borders[:, :, 1:, 3] |= across
+    down = values[:, :-1] != values[:, 1:]
+    borders[:, :-1, :, 2] |= down
+    borders[:, 1:, :, 0] |= down
+    borders |= holes[..., None]
+
+    return values, fills, borders, holes
+
+
+def pixel_bands(n_cells, cell_size, border_thickness, overall_border):
+    """
+    How many pixels along one axis of the image show every cell, the overall border counted as a cell
+    before and after the grid, and which of those pixels lie in the start / end border band of their
+    cell. Cells are drawn one pixel past their size in order, so a pixel on the edge of two cells
+    shows the later one.
+    """
+    pixels = np.arange(n_cells * cell_size + 2 * overall_border) - overall_border
+    owners = np.minimum(pixels // cell_size, n_cells - 1)
+    offsets = pixels - owners * cell_size
+    outside = (pixels < 0) | (pixels > n_cells * cell_size)
+    owners = np.where(outside, np.where(pixels < 0, -1, n_cells), owners) + 1
+    return owners, np.bincount(owners, minlength=n_cells + 2), ~outside & (offsets <= border_thickness), ~outside & (offsets >= cell_size - border_thickness)
+
+
+def render_labels(solutions, cell_size=100, border_thickness=4, overall_border=1):
+    """
+    The images of the solutions without the dates written in their holes, as an (n, height, width)
+    array of PALETTE indices. Every cell is spread over its pixels with np.repeat, the border bands
+    being worked out along one axis at a time.
+    """
+    values, fills, borders, holes = solution_arrays(solutions)
+    row_owners, row_counts, top_band, bottom_band = pixel_bands(5, cell_size, border_thickness, overall_border)
+    col_owners, col_counts, left_band, right_band = pixel_bands(7, cell_size, border_thickness, overall_border)
+
+    # The overall border as a frame of yellow cells without borders
+    fills = np.pad(np.broadcast_to(fills, holes.shape), ((0, 0), (1, 1), (1, 1)), constant_values=YELLOW)
+    borders = np.pad(borders, ((0, 0), (1, 1), (1, 1), (0, 0)))
+
+    top, right, bottom, left = np.moveaxis(borders, -1, 0)
+    dark_rows = top[:, row_owners] & top_band[:, None] | bottom[:, row_owners] & bottom_band[:, None]
+    dark_cols = left[:, :, col_owners] & left_band | right[:, :, col_owners] & right_band
+    dark = np.repeat(dark_rows, col_counts, axis=2) | np.repeat(dark_cols, row_counts, axis=1)
+
+    labels = np.repeat(np.repeat(fills, row_counts, axis=1), col_counts, axis=2)
+    labels[dark] = DARK
+    return labels, holes
+
+
+def palette_image(labels):
+    """
+    An RGB image of PALETTE indices.
+    """
+    image = Image.fromarray(labels, mode='P')
+    image.putpalette(PALETTE.reshape(-1).tolist())
+    return image.convert('RGB')
+
+
+def draw_hole_dates(image, holes, origin, cell_size, overall_border, font):
+    """
+    Writes the date of every hole (a (5, 7) bool array) of the grid drawn at origin, like draw_cell.
+    """
+    draw = ImageDraw.Draw(image)
+    for row, col in zip(*np.nonzero(holes)):
+        text = f'{7 * row + col + 1 - 4 * (row == 4)}'
+        text_bbox = draw.textbbox((0, 0), text, font=font)
+        text_x = origin[0] + col * cell_size + overall_border + (cell_size - (text_bbox[2] - text_bbox[0])) / 2
+        text_y = origin[1] + row * cell_size + overall_border + (cell_size - (text_bbox[3] - text_bbox[1])) / 2 - 5
+        draw.text((text_x, text_y), text, fill='white', font=font)
+
+
+def render_solution_fast(solution, cell_size=100, border_thickness=4, overall_border=1, font=None):
+    """
+    The same image as render_grid(create_sections(build_grid(...))), with only the dates drawn by PIL.
+    """
+    labels, holes = render_labels([solution], cell_size, border_thickness, overall_border)
+    image = palette_image(labels[0])
+    draw_hole_dates(image, holes[0], (0, 0), cell_size, overall_border, font or load_font(cell_size))
+    return image
+
+
+def render_sheet_fast(solutions, output_file="sheet.png", columns=10, cell_size=100, border_thickness=4, overall_border=1):
+    """
+    The same sheet as render_sheet, built as one array.
+    """
+    solutions = list(solutions)
+    if not solutions:
+        return None
+
+    labels, holes = render_labels(solutions, cell_size, border_thickness, overall_border)
+    n, height, width = labels.shape
+    rows = -(-n // columns)
+    columns = min(columns, n)
+
+    # Empty places of the last row stay white
+    labels = np.concatenate((labels, np.full((rows * columns - n, height, width), WHITE, dtype=np.uint8)))
+    sheet = palette_image(labels.reshape(rows, columns, height, width).transpose(0, 2, 1, 3).reshape(rows * height, columns * width))
+
+    font = load_font(cell_size)
+    for i in range(n):
+        draw_hole_dates(sheet, holes[i], ((i % columns) * width, (i // columns) * height), cell_size, overall_border, font)
+
+    sheet.save(output_file)
+    return sheet
+
+
 # Example input
 results = [
 """
@@ -397,11 +681,12 @@ Piece number = 7 --- 1 8 15 22 23
 """
 ]
 
-result_grids = []
+if __name__ == '__main__':
+    result_grids = []
 
-for i, result in enumerate(results):
-    piece_mapping = process_input(result)
-    grid = create_sections(build_grid(piece_mapping))
-    result_grids.append(grid)
-    create_grid_image(grid, output_file=f"final_images/grid_{i+1}.png")
+    for i, result in enumerate(results):
+        piece_mapping = process_input(result)
+        grid = create_sections(build_grid(piece_mapping))
+        result_grids.append(grid)
+        create_grid_image(grid, output_file=f"final_images/grid_{i+1}.png")
 
@@ -1,5 +1,7 @@
 import numpy as np
 import pickle
+from exact_cover.board import Board
+from exact_cover.storage import save_placements
 
 
 def dual_piece(piece):
@@ -70,48 +72,6 @@ def xy_to_date(x, y):
         raise ValueError(f'Invalid x, y coordinates - {x}, {y}')
 
 
-def add_hole_in_space(space, date):
-    date_x, date_y = date_to_xy(date)
-    space[date_x][date_y] = -1
-
-
-def can_place(space, piece, m):
-    """
-    Check if the piece can be placed on the grid at position (x, y).
-    Constraints:
-    - All piece cells should remain within grid bounds.
-    - piece cells must not overlap with existing filled cells.
-    - Space may be non-rectangular or have holes (represented by -1).
-    """
-    cells_filled = []
-    x, y = date_to_xy(m)
-
-    for i in range(len(piece)):
-        for j in range(len(piece[0])):
-            if piece[i][j] in ['B', 'W']:  # Part of the piece shape
-
-                # Check bounds for each cell
-                new_x, new_y = x + i, y + j
-                # print(f'new_x={new_x}, new_y={new_y}, x={x}, y={y}, i={i}, j={j}')
-                # Out of bounds
-                if new_x >= len(space) or new_y >= len(space[0]) or new_x < 0 or new_y < 0:
-                    # print('Out of bounds')
-                    return False
-                
-                # Check color coding
-                try:
-                    if space[new_x][new_y] != piece[i][j]:
-                        return False
-                    # if space[new_x][new_y] == -1:
-                    #     return False
-                except IndexError: # Indicates part of piece is out of bounds
-                    return False
-                
-                cells_filled.append(xy_to_date(new_x, new_y))
-                
-    return cells_filled
-
-
 def place_piece(space, cells_filled):
     for m in cells_filled:
         x, y = date_to_xy(m)
@@ -143,6 +103,15 @@ def print_space(space):
 
 
 
+BOARD = Board([
+    'BWBWBWB',
+    'WBWBWBW',
+    'BWBWBWB',
+    'WBWBWBW',
+    '....BWB',
+], xy_to_date)
+
+
 pentomino_set_A = [
     [
         ['W', 0, 0], 
@@ -209,41 +178,15 @@ def create_main_dict(piece_set):
     Value: All possible arrangements of the piece on the grid, where one arrangement is the list of squares / dates covered
     """
 
-    main_dict = dict()
-
-    for hole_date in range(1, 32):
-
-        my_space = [
-            ['B', 'W', 'B', 'W', 'B', 'W', 'B'],
-            ['W', 'B', 'W', 'B', 'W', 'B', 'W'],
-            ['B', 'W', 'B', 'W', 'B', 'W', 'B'],
-            ['W', 'B', 'W', 'B', 'W', 'B', 'W'],
-            [-1, -1, -1, -1, 'B', 'W', 'B'],
-        ]
-        add_hole_in_space(my_space, hole_date)
-
-        # Key: piece number, Value: list of cells filled
-        my_dict = dict()
-        for i in range(len(piece_set)):
-            my_dict[i] = []
+    orientation_sets = [generate_orientations(p) for p in piece_set]
+    return BOARD.create_main_dict(orientation_sets, range(1, 32))
 
-        for piece_number, p in enumerate(piece_set):
-            for date in range(1, 32):
-                for orientation in generate_orientations(p):
-                    cells_filled = can_place(my_space, orientation, date)
-                    if cells_filled:
-                        my_dict[piece_number].append(cells_filled)
-
-
-        main_dict[hole_date] = my_dict
-        
-    return main_dict
-    
 
 
 if __name__ == '__main__':
     md = create_main_dict(pentomino_set_A)
     with open('main_dict.pickle', 'wb') as f:
         pickle.dump(md, f)
+    save_placements('main_dict.ecm', md)
 
 
@@ -1,5 +1,5 @@
 import numpy as np
-import pickle
+from exact_cover.board import Board
 import datetime
 
 
@@ -38,41 +38,6 @@ def print_piece(piece):
     print()
 
 
-def can_place(space, piece, m):
-    """
-    Check if the piece can be placed on the grid at position m = (x, y).
-    Constraints:
-    - All piece cells should remain within grid bounds.
-    - piece cells must not overlap with existing filled cells.
-    - Space may be non-rectangular or have holes (represented by -1).
-    """
-    cells_filled = []
-    x, y = m_to_xy(m)
-
-    for i in range(len(piece)):
-        for j in range(len(piece[0])):
-            if piece[i][j]:  # Part of the piece shape
-
-                # Check bounds for each cell
-                new_x, new_y = x + i, y + j
-
-                # Out of bounds
-                if new_x >= len(space) or new_y >= len(space[0]) or new_x < 0 or new_y < 0:
-                    # print('Out of bounds')
-                    return False
-                
-                # Check holes
-                try:
-                    if space[new_x][new_y] == -1:
-                        return False
-                except IndexError: # Indicates part of piece is out of bounds
-                    return False
-                
-                cells_filled.append(xy_to_m(new_x, new_y))
-                
-    return cells_filled
-
-
 def print_space(space):
     max_width = 1
 
@@ -116,11 +81,6 @@ def m_to_xy(m):
         raise ValueError(f'Invalid m -- {m}')
 
 
-def add_hole_in_space(space, m):
-    x, y = m_to_xy(m)
-    space[x][y] = -1
-
-
 def place_piece(space, cells_filled):
     for m in cells_filled:
         x, y = m_to_xy(m)
@@ -139,6 +99,18 @@ def remove_piece(space, cells_filled):
             raise ValueError(f'Invalid space -- {space[x][y]}')
 
 
+BOARD = Board([
+    'ooooooo',
+    'ooooooo',
+    'ooooooo',
+    'ooooooo',
+    'ooooooo',
+    'ooooooo',
+    'ooooooo',
+    '...oooo',
+], xy_to_m)
+
+
 def get_all_m_triples():
     for month in range(1, 13):
         for date in range(1, 32):
@@ -167,41 +139,8 @@ def create_main_dict(piece_set):
     Value: All possible arrangements of the piece on the grid, where one arrangement is the list of squares / dates covered
     """
 
-    main_dict = dict()
-
-    for m_triple_hole in get_all_m_triples():
-
-        my_space = [
-            [0, 0, 0, 0, 0, 0, 0],
-            [0, 0, 0, 0, 0, 0, 0],
-            [0, 0, 0, 0, 0, 0, 0],
-            [0, 0, 0, 0, 0, 0, 0],
-            [0, 0, 0, 0, 0, 0, 0],
-            [0, 0, 0, 0, 0, 0, 0],
-            [0, 0, 0, 0, 0, 0, 0],
-            [-1, -1, -1, 0, 0, 0, 0],
-        ]
-
-        add_hole_in_space(my_space, m_triple_hole[0])
-        add_hole_in_space(my_space, m_triple_hole[1])
-        add_hole_in_space(my_space, m_triple_hole[2])
-
-        # Key: piece number, Value: list of cells filled
-        my_dict = dict()
-        for i in range(len(piece_set)):
-            my_dict[i] = []
-
-        for piece_number, p in enumerate(piece_set):
-            for m in range(1, 54):
-                for orientation in generate_orientations(p):
-                    cells_filled = can_place(my_space, orientation, m)
-                    if cells_filled:
-                        my_dict[piece_number].append(cells_filled)
-
-
-        main_dict[m_triple_hole] = my_dict
-        
-    return main_dict
+    orientation_sets = [generate_orientations(p) for p in piece_set]
+    return BOARD.create_main_dict(orientation_sets, get_all_m_triples())
 
 
 
@@ -266,35 +205,16 @@ pentomino_set = [
 if __name__ == '__main__':
     pass
 
-    md = create_main_dict(pentomino_set)
-    # with open('main_dict_full.pickle', 'wb') as f:
-    #     pickle.dump(md, f)
-
+    # Every hole triple is filtered and written as it comes
+    orientation_sets = [generate_orientations(p) for p in pentomino_set]
+    BOARD.write_main_dict('main_dict_full.ecm', orientation_sets, get_all_m_triples())
 
-    # my_space = [
-    #     [0, 0, 0, 0, 0, 0, 0],
-    #     [0, 0, 0, 0, 0, 0, 0],
-    #     [0, 0, 0, 0, 0, 0, 0],
-    #     [0, 0, 0, 0, 0, 0, 0],
-    #     [0, 0, 0, 0, 0, 0, 0],
-    #     [0, 0, 0, 0, 0, 0, 0],
-    #     [0, 0, 0, 0, 0, 0, 0],
-    #     [-1, -1, -1, 0, 0, 0, 0],
-    # ]
 
     # p = pentomino_set[1]
-    # m_triple = (6, 39, 48)
-    # for m in m_triple:
-    #     add_hole_in_space(my_space, m)
-
-    # for m in range(1, 54):
-    #     print(f'm = {m}')
-    #     for orientation in generate_orientations(p):
-    #         cells_filled = can_place(my_space, orientation, m)
-    #         if cells_filled:
-    #             place_piece(my_space, cells_filled)
-    #             print_space(my_space)
-    #             remove_piece(my_space, cells_filled)
-    #             print()
-
+    # my_space = BOARD.space((6, 39, 48))
 
+    # for _, cells_filled in BOARD.placements(generate_orientations(p)):
+    #     place_piece(my_space, cells_filled)
+    #     print_space(my_space)
+    #     remove_piece(my_space, cells_filled)
+    #     print()
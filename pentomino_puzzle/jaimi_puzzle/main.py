@@ -1,26 +1,21 @@
-from dlx import DancingLinks
-import pickle
+from exact_cover import solver
+from exact_cover.sweep import run_sweep
+from framework import BOARD, generate_orientations, get_all_m_triples, pentomino_set
 import numpy as np
+import argparse
 import itertools
 
 
-with open('main_dict_full.pickle', 'rb') as f:
-    main_dict = pickle.load(f)
+# Placements for every hole triple, filtered from the hole-free ones when a triple is looked up
+main_dict = BOARD.placement_table([generate_orientations(p) for p in pentomino_set], get_all_m_triples())
 
 
 def create_matrix(piece_numbers, m_triple):
     dancing_links_matrix = []
 
-    # Rows that correspond to the holes
-    rows_holes = [[0 for _ in range(63)] for _ in range(3)]
-    rows_holes[0][m_triple[0] - 1] = 1
-    rows_holes[1][m_triple[1] - 1] = 1
-    rows_holes[2][m_triple[2] - 1] = 1
-    dancing_links_matrix.extend(rows_holes)
-
     # For a given piece number, add the rows that correspond to what cells can be filled
     for shift, piece_number in enumerate(piece_numbers):
-        for cells_filled in my_dict[piece_number]:
+        for cells_filled in main_dict[m_triple][piece_number]:
 
             # 63 columns for ---
             # 31 dates + 12 months + 7 days +
@@ -39,13 +34,19 @@ def create_matrix(piece_numbers, m_triple):
     return dancing_links_matrix
 
 
+def hole_columns(m_triple):
+    """
+    Columns of the holes; no placement covers them so they are secondary columns that stay empty
+    """
+    return [m - 1 for m in m_triple]
+
+
 def main(piece_numbers, m_triple, multi_solution_flag=False):
     dancing_links_matrix = create_matrix(piece_numbers, m_triple)
-    dl = DancingLinks(dancing_links_matrix)
+    dl = solver(dancing_links_matrix, backend='bitset', secondary=hole_columns(m_triple))
 
     if multi_solution_flag:
-        dl.search(multi_solution_flag=True)
-        return dl.no_of_solutions
+        return dl.count_solutions()
 
     solution = dl.solve()
 
@@ -60,19 +61,57 @@ def main(piece_numbers, m_triple, multi_solution_flag=False):
         return False
 
 
+def _solve_chunk(units):
+    """
+    The first solution of every (m_triple, piece numbers) as [[piece number, cells filled], ...], None if there is none.
+    """
+    out = []
+    for m_triple, piece_numbers in units:
+        dancing_links_matrix = create_matrix(piece_numbers, m_triple)
+        solution = solver(dancing_links_matrix, backend='bitset', secondary=hole_columns(m_triple)).solve()
+        out.append([
+            [piece_numbers[int(np.argmax(dancing_links_matrix[mtx_ind][53:]))], (np.flatnonzero(dancing_links_matrix[mtx_ind][:53]) + 1).tolist()]
+            for mtx_ind in sorted(solution)
+        ] if solution else None)
+    return out
+
+
+def sweep(journal_path, piece_numbers, processes=None, chunk_size=8):
+    """
+    Solves every triple with the pieces in a pool of processes, journalling every triple as it is
+    done (exact_cover.sweep) so a stopped sweep resumes. Returns {m_triple: first solution or None}.
+    """
+    units = [(m_triple, tuple(piece_numbers)) for m_triple in main_dict]
+    results = run_sweep(units, _solve_chunk, journal_path, processes, chunk_size=chunk_size)
+    return {m_triple: solution for (m_triple, _), solution in results.items()}
+
+
 
 
 my_m_triple = (6, 39, 48)
-my_dict = main_dict[my_m_triple]
 
 piece_numbers = [0, 1, 2, 3, 4, 5, 6, 7, 10, 11]
 
 # print(main(piece_numbers, my_m_triple, multi_solution_flag=True))
 
-for my_m_triple, my_dict in main_dict.items():
-    print(my_m_triple)
-    print(main(piece_numbers, my_m_triple, multi_solution_flag=False))
-    print('-'*40+'\n\n')
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='python main.py [--sweep sweep_jaimi.jsonl] -- solves every triple, with --sweep in a pool of processes resuming from the journal')
+    parser.add_argument('--sweep', metavar='JOURNAL')
+    parser.add_argument('--processes', type=int, default=None)
+    args = parser.parse_args()
+
+    if args.sweep:
+        solutions = sweep(args.sweep, piece_numbers, processes=args.processes)
+        for my_m_triple, solution in solutions.items():
+            if solution is None:
+                print(my_m_triple, 'No solution')
+        print(f'{sum(solution is not None for solution in solutions.values())} / {len(solutions)} triples solved')
+
+    else:
+        for my_m_triple in main_dict:
+            print(my_m_triple)
+            print(main(piece_numbers, my_m_triple, multi_solution_flag=False))
+            print('-'*40+'\n\n')
 
 
 
@@ -1,17 +1,24 @@
-from dlx import DancingLinks
-import pickle
+from exact_cover import solver
+from exact_cover.results import SolutionIndex, SolutionWriter
+from exact_cover.storage import load_placements
+from exact_cover.sweep import run_sweep
 import numpy as np
+import argparse
 import itertools
+import os
 
 
-with open('mini_dict.pickle', 'rb') as f:
-    main_dict = pickle.load(f)
+main_dict = load_placements('main_dict.ecm')
 
 
-def create_matrix(piece_numbers, date):
+def create_matrix(piece_numbers, date, placements=None):
+    # The placements of the date in main_dict unless others are given
+    if placements is None:
+        placements = main_dict[date]
+
     dancing_links_matrix = []
     for shift, piece_number in enumerate(piece_numbers):
-        for cells_filled in my_dict[piece_number]:
+        for cells_filled in placements[piece_number]:
 
             # 31 columns for the 31 dates and one hot encoding for the piece number
             new_row = [0 for _ in range(31 + len(piece_numbers))]
@@ -31,24 +38,44 @@ def create_matrix(piece_numbers, date):
     return dancing_links_matrix
 
 
-def main(piece_numbers, date, multi_solution_flag=False):
+def solution_cells(dancing_links_matrix, solution, piece_numbers, date):
+    """
+    {piece number: dates filled} for a solution of the matrix of create_matrix, in piece order.
+    """
+    out = dict()
+    for mtx_ind in sorted(solution, key=lambda mtx_ind: np.argmax(dancing_links_matrix[mtx_ind][30:])):
+        piece_number = piece_numbers[np.argmax(dancing_links_matrix[mtx_ind][30:])]
+
+        # The hole's column was removed, so the columns after it are one date further
+        out[piece_number] = [ind + 1 if ind < date - 1 else ind + 2 for ind in np.flatnonzero(dancing_links_matrix[mtx_ind][:30]).tolist()]
+    return out
+
+
+def print_solution(solution):
+    for piece_number, cells_filled in solution.items():
+        print(f'\nPiece number = {piece_number} ---', ' '.join(map(str, cells_filled)), end=' ')
+
+
+def main(piece_numbers, date, multi_solution_flag=False, workers=None, sink=None):
+    """
+    Solves the date with the pieces, printing the solutions or writing them into sink (a SolutionWriter).
+    """
     dancing_links_matrix = create_matrix(piece_numbers, date)
-    dl = DancingLinks(dancing_links_matrix)
+    dl = solver(dancing_links_matrix, backend='bitset')
 
     if multi_solution_flag:
-        dl.search(multi_solution_flag=True)
+        if workers:
+            dl.parallel_search(workers=workers)
+        else:
+            dl.search(multi_solution_flag=True)
         # return dl.no_of_solutions
 
         for solution in dl.all_solutions:
-            for mtx_ind, piece_number in zip(solution, piece_numbers):
-                print(f'\nPiece number = {piece_number} ---', end = ' ')
-                for ind, cell in enumerate(dancing_links_matrix[mtx_ind][:30]):
-                    if cell == 1:
-                        if ind < date - 1:
-                            print(ind + 1, end=' ')
-                        else:
-                            print(ind + 2, end=' ')
-            print('\n')
+            if sink is not None:
+                sink.write(date, solution_cells(dancing_links_matrix, solution, piece_numbers, date))
+            else:
+                print_solution(solution_cells(dancing_links_matrix, solution, piece_numbers, date))
+                print('\n')
         return
 
 
@@ -56,15 +83,11 @@ def main(piece_numbers, date, multi_solution_flag=False):
 
     # Show the solution
     if solution:
-        for mtx_ind, piece_number in zip(solution, piece_numbers):
-            print(f'\nPiece number = {piece_number} ---', end=' ')
-            for ind, cell in enumerate(dancing_links_matrix[mtx_ind][:30]):
-                if cell == 1:
-                    if ind < date - 1:
-                        print(ind + 1, end=' ')
-                    else:
-                        print(ind + 2, end=' ')
-        print()
+        if sink is not None:
+            sink.write(date, solution_cells(dancing_links_matrix, solution, piece_numbers, date))
+        else:
+            print_solution(solution_cells(dancing_links_matrix, solution, piece_numbers, date))
+            print()
         return True
     else:
         # print('No solution')
@@ -72,6 +95,118 @@ def main(piece_numbers, date, multi_solution_flag=False):
 
 
 
+def count(piece_numbers, date, memo_size=2**20):
+    """
+    Number of solutions, counting every residual board only once
+    """
+    dancing_links_matrix = create_matrix(piece_numbers, date)
+    return solver(dancing_links_matrix, backend='bitset').count_solutions(memo_size=memo_size)
+
+
+
+def create_master_matrix(piece_numbers=range(8)):
+    """
+    Every placement of the pieces on the board without a hole, from all the dates in main_dict.
+    31 columns for the 31 dates and one hot encoding for the piece number, so the matrix for a date
+    and a combination is this one without the date's column, the unused pieces' columns and their rows.
+    """
+    dancing_links_matrix = []
+    seen = set()
+    for shift, piece_number in enumerate(piece_numbers):
+        for my_dict in main_dict.values():
+            for cells_filled in my_dict[piece_number]:
+                if (shift, frozenset(cells_filled)) in seen:
+                    continue
+                seen.add((shift, frozenset(cells_filled)))
+
+                new_row = [0 for _ in range(31 + len(piece_numbers))]
+                for cell in cells_filled:
+                    new_row[cell - 1] = 1
+                new_row[31 + shift] = 1
+                dancing_links_matrix.append(new_row)
+
+    return np.array(dancing_links_matrix)
+
+
+def solve_all(dates=range(1, 32), n_pieces=6, multi_solution_flag=False):
+    """
+    Solves every date with every n_pieces / 8 pentomino combination on one solver built from the
+    master matrix, every instance only excluding its hole and the pieces it doesn't use.
+    Returns the master matrix and {(date, combination): first solution or False / all solutions},
+    the solutions being rows of the master matrix.
+    """
+    master_matrix = create_master_matrix()
+    dl = solver(master_matrix, backend='bitset')
+
+    instances = [(date, combination) for date in dates for combination in itertools.combinations(range(8), n_pieces)]
+    return master_matrix, dict(zip(instances, dl.search_batch(excluded_columns(instances), multi_solution_flag=multi_solution_flag)))
+
+
+def excluded_columns(instances):
+    """
+    The columns of the master matrix every (date, combination) excludes -- its hole and the unused pieces.
+    """
+    for date, combination in instances:
+        yield [date - 1] + [31 + piece_number for piece_number in range(8) if piece_number not in combination]
+
+
+def write_solutions(path, dates=range(1, 32), n_pieces=6, chunk_size=1024, index_path=None):
+    """
+    Streams every solution of every date with every n_pieces / 8 pentomino combination into a results
+    file (exact_cover.results) as the dates are solved, for draw.py.
+    With index_path (a SolutionIndex file), tilings found by earlier runs are skipped and the file
+    is appended to; the index then holds every distinct tiling written so far.
+    """
+    master_matrix = create_master_matrix()
+    dl = solver(master_matrix, backend='bitset')
+
+    instances = [(date, combination) for date in dates for combination in itertools.combinations(range(8), n_pieces)]
+    index = SolutionIndex(index_path) if index_path else None
+    if index is not None and os.path.exists(path):
+        # The index is only saved at the end, a run that stopped before may have written more
+        index.add_file(path)
+    with SolutionWriter(path, chunk_size=chunk_size, append=index is not None) as sink:
+        for (date, combination), solutions in zip(instances, dl.search_batch(excluded_columns(instances), multi_solution_flag=True)):
+            for solution in solutions:
+                # Rows of the master matrix -- dates in the first 31 columns, then the piece number
+                solution = {
+                    int(np.argmax(master_matrix[row_ind][31:])): (np.flatnonzero(master_matrix[row_ind][:31]) + 1).tolist()
+                    for row_ind in sorted(solution)
+                }
+                if index is None or index.add(solution):
+                    sink.write(date, solution)
+
+    if index is not None:
+        index.save()
+        print(f'{sink.n_written} new tilings, {len(index)} distinct in {index_path}')
+    return sink.n_written
+
+
+def _init_sweep_worker():
+    global _sweep_solver
+    _sweep_solver = solver(create_master_matrix(), backend='bitset')
+
+
+def _count_chunk(instances):
+    return list(_sweep_solver.search_batch(excluded_columns(instances), count_only=True))
+
+
+def sweep(journal_path, dates=range(1, 32), n_pieces=6, processes=None, chunk_size=16):
+    """
+    Counts the solutions of every date with every n_pieces / 8 pentomino combination in a pool of
+    processes, journalling every (date, combination) as it is done (exact_cover.sweep), so a sweep
+    that was stopped picks up where it left off. Returns {date: solution count}.
+    """
+    instances = [(date, combination) for date in dates for combination in itertools.combinations(range(8), n_pieces)]
+    counts = run_sweep(instances, _count_chunk, journal_path, processes, _init_sweep_worker, chunk_size=chunk_size)
+
+    solution_counts = {date: 0 for date in dates}
+    for (date, combination), no_of_solutions in counts.items():
+        solution_counts[date] += no_of_solutions
+    return solution_counts
+
+
+
 my_date = 31
 my_dict = main_dict[my_date]
 
@@ -97,3 +232,14 @@ my_dict = main_dict[my_date]
 #         solution_count += main(combination, my_date)
 #         print('\n')
 # print(f'Solution count for date {my_date} = {solution_count}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='python main.py --sweep sweep_6p.jsonl -- counts every date with every 6 / 8 pentomino combination, resuming from the journal')
+    parser.add_argument('--sweep', metavar='JOURNAL')
+    parser.add_argument('--processes', type=int, default=None)
+    args = parser.parse_args()
+
+    if args.sweep:
+        for date, no_of_solutions in sweep(args.sweep, processes=args.processes).items():
+            print(f'Solution count for date {date} = {no_of_solutions}')
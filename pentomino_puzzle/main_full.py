@@ -1,11 +1,11 @@
-from dlx import DancingLinks
-import pickle
+from exact_cover import solver
+from framework_full import BOARD, generate_orientations, get_all_m_triples, pentomino_set_A
 import numpy as np
 import itertools
 
 
-with open('main_dict_full.pickle', 'rb') as f:
-    main_dict = pickle.load(f)
+# Placements for every hole triple, filtered from the hole-free ones when a triple is looked up
+main_dict = BOARD.placement_table([generate_orientations(p) for p in pentomino_set_A], get_all_m_triples())
 
 
 def create_matrix(piece_numbers, m_triple):
@@ -35,11 +35,10 @@ def create_matrix(piece_numbers, m_triple):
 
 def main(piece_numbers, m_triple, multi_solution_flag=False):
     dancing_links_matrix = create_matrix(piece_numbers, m_triple)
-    dl = DancingLinks(dancing_links_matrix)
+    dl = solver(dancing_links_matrix, backend='bitset')
 
     if multi_solution_flag:
-        dl.search(multi_solution_flag=True)
-        return dl.no_of_solutions
+        return dl.count_solutions()
 
     solution = dl.solve()
 
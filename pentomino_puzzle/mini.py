@@ -1,7 +1,9 @@
 import numpy as np
 import pickle
 from itertools import combinations
-from dlx import DancingLinks
+from exact_cover import solver
+from exact_cover.board import Board
+from exact_cover.storage import save_placements, load_placements
 
 
 def dual_piece(piece):
@@ -68,48 +70,6 @@ def xy_to_m(x, y):
         raise ValueError(f'Invalid x, y coordinates - {x}, {y}')
 
 
-def add_hole_in_space(space, m):
-    m_x, m_y = m_to_xy(m)
-    space[m_x][m_y] = -1
-
-
-def can_place(space, piece, m):
-    """
-    Check if the piece can be placed on the grid at position m.
-    Constraints:
-    - All piece cells should remain within grid bounds.
-    - piece cells must not overlap with existing filled cells.
-    - Space may be non-rectangular or have holes (represented by -1).
-    """
-    cells_filled = []
-    x, y = m_to_xy(m)
-
-    for i in range(len(piece)):
-        for j in range(len(piece[0])):
-            if piece[i][j] in ['B', 'W']:  # Part of the piece shape
-
-                # Check bounds for each cell
-                new_x, new_y = x + i, y + j
-                # print(f'new_x={new_x}, new_y={new_y}, x={x}, y={y}, i={i}, j={j}')
-                # Out of bounds
-                if new_x >= len(space) or new_y >= len(space[0]) or new_x < 0 or new_y < 0:
-                    # print('Out of bounds')
-                    return False
-                
-                # Check color coding
-                try:
-                    if space[new_x][new_y] != piece[i][j]:
-                        return False
-                    # if space[new_x][new_y] == -1:
-                    #     return False
-                except IndexError: # Indicates part of piece is out of bounds
-                    return False
-                
-                cells_filled.append(xy_to_m(new_x, new_y))
-                
-    return cells_filled
-
-
 def place_piece(space, cells_filled):
     for m in cells_filled:
         x, y = m_to_xy(m)
@@ -138,6 +98,16 @@ def print_space(space):
     print()
 
 
+BOARD = Board([
+    'BWBWBWB',
+    'WBWBWBW',
+    'BWBWBWB',
+    'WBWBWBW',
+    'BWBWBWB',
+    '..BWBWB',
+], xy_to_m)
+
+
 def create_main_dict(piece_set):
     """
     Creates a dictionary where - 
@@ -149,63 +119,39 @@ def create_main_dict(piece_set):
     Value: All possible arrangements of the piece on the grid, where one arrangement is the list of squares / dates covered
     """
 
-    main_dict = dict()
+    orientation_sets = [generate_orientations(p) for p in piece_set]
+    return BOARD.create_main_dict(orientation_sets, combinations(range(36, 43), 2))
 
-    for hole1, hole2 in combinations(range(36, 43), 2):
-
-        my_space = [
-            ['B', 'W', 'B', 'W', 'B', 'W', 'B'],
-            ['W', 'B', 'W', 'B', 'W', 'B', 'W'],
-            ['B', 'W', 'B', 'W', 'B', 'W', 'B'],
-            ['W', 'B', 'W', 'B', 'W', 'B', 'W'],
-            ['B', 'W', 'B', 'W', 'B', 'W', 'B'],
-            [-1, -1, 'B', 'W', 'B', 'W', 'B'],
-        ]
-        add_hole_in_space(my_space, hole1)
-        add_hole_in_space(my_space, hole2)
-
-        # Key: piece number, Value: list of cells filled
-        my_dict = dict()
-        for i in range(len(piece_set)):
-            my_dict[i] = []
-
-        for piece_number, p in enumerate(piece_set):
-            for m in range(1, 43):
-                for orientation in generate_orientations(p):
-                    cells_filled = can_place(my_space, orientation, m)
-                    if cells_filled:
-                        my_dict[piece_number].append(cells_filled)
-
-
-        main_dict[(hole1, hole2)] = my_dict
-        
-    return main_dict
-    
 
 def save_main_dict(piece_set, filename):
     md = create_main_dict(piece_set)
     with open(filename, 'wb') as f:
         pickle.dump(md, f)
+    save_placements(filename.rsplit('.', 1)[0] + '.ecm', md)
 
 
-def create_matrix(piece_numbers, holes):
+def create_matrix(piece_numbers, holes, placements=None):
+    # The placements of the holes set by the loop below unless others are given
+    if placements is None:
+        placements = my_dict
+
     dancing_links_matrix = []
     for shift, piece_number in enumerate(piece_numbers):
-        for cells_filled in my_dict[piece_number]:
+        for cells_filled in placements[piece_number]:
 
-            # 40 columns for the 40 dates and one hot encoding for the piece number
-            new_row = [0 for _ in range(40 + len(piece_numbers))]
+            # 42 columns for the 42 squares and one hot encoding for the piece number
+            new_row = [0 for _ in range(42 + len(piece_numbers))]
 
             for cell in cells_filled:
                 new_row[cell - 1] = 1
 
-            new_row[40 + shift] = 1
+            new_row[42 + shift] = 1
             dancing_links_matrix.append(new_row)
 
 
     dancing_links_matrix = np.array(dancing_links_matrix)
 
-    # Remove columns with all zeros which are holes
+    # Remove the columns of the holes, leaving 40 for the dates
     dancing_links_matrix = np.delete(dancing_links_matrix, [holes[0] - 1, holes[1] - 1], axis=1)
 
     return dancing_links_matrix
@@ -215,7 +161,7 @@ def main(piece_numbers, holes, multi_solution_flag=False):
     dancing_links_matrix = create_matrix(piece_numbers, holes)
     # indices of the columns where all the values are zero
 
-    dl = DancingLinks(dancing_links_matrix)
+    dl = solver(dancing_links_matrix, backend='bitset')
 
     hole1, hole2 = min(holes), max(holes)
 
@@ -315,37 +261,22 @@ if __name__ == '__main__':
         ]
     ]
 
-    with open('mini_dict.pickle', 'rb') as f:
-        main_dict = pickle.load(f)
+    main_dict = load_placements('mini_dict.ecm')
 
     for holes, my_dict in main_dict.items():
         print(f'Holes = {holes}')
-        my_space = [
-                ['B', 'W', 'B', 'W', 'B', 'W', 'B'],
-                ['W', 'B', 'W', 'B', 'W', 'B', 'W'],
-                ['B', 'W', 'B', 'W', 'B', 'W', 'B'],
-                ['W', 'B', 'W', 'B', 'W', 'B', 'W'],
-                ['B', 'W', 'B', 'W', 'B', 'W', 'B'],
-                ['W', 'B', 'W', 'B', 'W', 'B', 'W'],
-            ]
-        add_hole_in_space(my_space, holes[0])
-        add_hole_in_space(my_space, holes[1])
-
         main([0, 1, 2, 3, 4, 5, 6, 7], holes)
         break
 
     
 
     # p = pentomino_set_A[4]
+    # my_space = BOARD.space(holes)
 
-    # for m in range(1, 43):
-    #     print(f"m = {m}")
-    #     for orientation in generate_orientations(p):
-    #         cells_filled = can_place(my_space, orientation, m)
-    #         if cells_filled:
-    #             place_piece(my_space, cells_filled)
-    #             print_space(my_space)
-    #             remove_piece(my_space, cells_filled)
-    #             print()
+    # for _, cells_filled in BOARD.placements(generate_orientations(p)):
+    #     place_piece(my_space, cells_filled)
+    #     print_space(my_space)
+    #     remove_piece(my_space, cells_filled)
+    #     print()
 
 
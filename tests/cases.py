@@ -0,0 +1,101 @@
+"""
+The small matrices every backend is checked on, and plain backtracking to check them against.
+"""
+import numpy as np
+
+
+def reference_solutions(mtx, secondary=()):
+    """
+    Plain backtracking without any links, as a reference -- every set of rows covering each primary
+    column exactly once and each secondary column at most once.
+    """
+    mtx = np.asarray(mtx)
+    primary = [col_ind for col_ind in range(mtx.shape[1]) if col_ind not in secondary]
+    out = []
+
+    def extend(chosen, covered):
+        uncovered = [col_ind for col_ind in primary if not covered[col_ind]]
+        if not uncovered:
+            out.append(frozenset(chosen))
+            return
+        for row_ind in np.flatnonzero(mtx[:, uncovered[0]]):
+            if not (mtx[row_ind].astype(bool) & covered).any():
+                extend(chosen + [row_ind], covered | mtx[row_ind].astype(bool))
+
+    extend([], np.zeros(mtx.shape[1], dtype=bool))
+    return sorted(out, key=sorted)
+
+
+def as_sets(solutions):
+    """
+    Solutions as sorted frozensets, to compare them whatever order they were found in.
+    """
+    return sorted(map(frozenset, solutions), key=sorted)
+
+
+MATRICES = [
+    np.array([
+        [1],
+    ]),
+    np.array([
+        [1, 0, 0],
+        [0, 1, 0],
+        [0, 0, 1],
+    ]),
+    np.array([
+        [1, 0, 1],
+        [1, 1, 0],
+        [0, 1, 1],
+    ]),
+    np.array([
+        [1, 0, 1],
+        [1, 1, 0],
+        [0, 1, 1],
+        [0, 0, 1],
+    ]),
+    np.eye(10, dtype=int),
+    np.array([
+        [1, 1, 0, 0, 1, 0, 1],
+        [1, 0, 1, 1, 0, 1, 0],
+        [0, 1, 1, 0, 1, 0, 1],
+        [1, 0, 0, 1, 0, 1, 1],
+        [0, 1, 0, 1, 1, 1, 0],
+        [1, 1, 1, 0, 0, 0, 1],
+    ]),
+    np.array([
+        [1, 1],
+        [1, 1],
+        [0, 1],
+    ]),
+    np.array([
+        [1, 0, 0],
+        [0, 1, 0],
+        [0, 1, 0],
+        [1, 0, 0],
+        [0, 0, 1],
+    ]),
+    np.array([
+        [1, 1],
+        [0, 0],
+        [1, 0],
+        [0, 1],
+        [1, 1],
+    ]),
+    np.array([
+        [0, 0],
+        [1, 0],
+        [0, 1],
+    ]),
+]
+
+_rng = np.random.default_rng(0)
+MATRICES.extend((_rng.random((_rng.integers(1, 16), _rng.integers(1, 8))) < 0.35).astype(int) for _ in range(200))
+
+# Every matrix once with only primary columns and once with a random set of secondary columns
+PRIMARY_CASES = [(mtx, None) for mtx in MATRICES]
+SECONDARY_CASES = [(mtx, np.flatnonzero(_rng.random(mtx.shape[1]) < 0.3)) for mtx in MATRICES]
+CASES = PRIMARY_CASES + SECONDARY_CASES
+
+
+def optional_columns(secondary):
+    return set() if secondary is None else set(secondary.tolist())
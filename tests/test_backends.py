@@ -0,0 +1,107 @@
+import numpy as np
+import pytest
+
+from exact_cover import BACKENDS, solver
+from cases import CASES, PRIMARY_CASES, as_sets, reference_solutions
+
+
+@pytest.mark.parametrize('case_no', range(len(CASES)))
+def test_backends_agree(case_no):
+    # Same solutions in the same order, after the same number of nodes
+    mtx, secondary = CASES[case_no]
+    results, stats = dict(), dict()
+    for backend in BACKENDS:
+        dl = solver(mtx, backend=backend, secondary=secondary)
+        dl.search(multi_solution_flag=True)
+        results[backend], stats[backend] = dl.all_solutions, dl.stats
+
+    assert all(solutions == results['linked'] for solutions in results.values()), results
+    assert all(counts['nodes'] == stats['linked']['nodes'] for counts in stats.values()), stats
+    assert stats['array'] == stats['linked']
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+@pytest.mark.parametrize('case_no', range(len(PRIMARY_CASES)))
+def test_matches_reference(case_no, backend):
+    mtx, _ = PRIMARY_CASES[case_no]
+    dl = solver(mtx, backend=backend)
+    dl.search(multi_solution_flag=True)
+    assert as_sets(dl.all_solutions) == reference_solutions(mtx)
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        solver(np.eye(2, dtype=int), backend='quantum')
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+@pytest.mark.parametrize('case_no', range(len(CASES)))
+def test_every_heuristic_finds_the_same_solutions(case_no, backend):
+    mtx, secondary = CASES[case_no]
+    dl = solver(mtx, backend=backend, secondary=secondary)
+    dl.search(multi_solution_flag=True)
+
+    for heuristic in BACKENDS[backend].HEURISTICS:
+        other = solver(mtx, backend=backend, secondary=secondary, heuristic=heuristic, seed=case_no)
+        other.search(multi_solution_flag=True)
+        assert as_sets(other.all_solutions) == as_sets(dl.all_solutions), heuristic
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+@pytest.mark.parametrize('case_no', range(len(CASES)))
+def test_every_heuristic_resumes_half_way(case_no, backend):
+    mtx, secondary = CASES[case_no]
+    expected = list(solver(mtx, backend=backend, secondary=secondary).iter_solutions())
+
+    for heuristic in BACKENDS[backend].HEURISTICS:
+        dl = solver(mtx, backend=backend, secondary=secondary, heuristic=heuristic, seed=case_no)
+        half = [solution for _, solution in zip(range(len(expected) // 2), dl.iter_solutions())]
+        state = dl.get_state() if half else None
+        rest = list(solver(mtx, backend=backend, secondary=secondary, heuristic=heuristic).iter_solutions(state))
+        assert as_sets(half + rest) == as_sets(expected), heuristic
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+@pytest.mark.parametrize('case_no', range(len(CASES)))
+def test_resume_after_every_solution(case_no, backend):
+    # Pausing after every solution and resuming on a fresh instance gives the same solutions
+    mtx, secondary = CASES[case_no]
+    expected = list(solver(mtx, backend=backend, secondary=secondary).iter_solutions())
+
+    resumed, state = [], None
+    while True:
+        dl = solver(mtx, backend=backend, secondary=secondary)
+        solution = next(dl.iter_solutions(state), None)
+        if solution is None:
+            break
+        resumed.append(solution)
+        state = dl.get_state()
+    assert resumed == expected
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+@pytest.mark.parametrize('case_no', range(len(CASES)))
+def test_search_streams_to_sink(case_no, backend):
+    mtx, secondary = CASES[case_no]
+    dl = solver(mtx, backend=backend, secondary=secondary)
+    dl.search(multi_solution_flag=True)
+
+    streamed = []
+    solver(mtx, backend=backend, secondary=secondary).search(multi_solution_flag=True, sink=streamed.append)
+    assert streamed == dl.all_solutions
+
+
+@pytest.mark.parametrize('depth', [1, 2])
+@pytest.mark.parametrize('backend', BACKENDS)
+@pytest.mark.parametrize('case_no', range(len(CASES)))
+def test_split_at_first_levels(case_no, backend, depth):
+    # Splitting at the first branching levels covers every solution exactly once
+    mtx, secondary = CASES[case_no]
+    expected = list(solver(mtx, backend=backend, secondary=secondary).iter_solutions())
+
+    split = []
+    for prefix in solver(mtx, backend=backend, secondary=secondary).iter_solutions(max_depth=depth):
+        dl = solver(mtx, backend=backend, secondary=secondary)
+        dl.search(multi_solution_flag=True, pre_solution=prefix)
+        split.extend(dl.all_solutions)
+    assert split == expected
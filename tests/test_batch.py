@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+
+from exact_cover import BACKENDS, solver
+from cases import CASES, as_sets, reference_solutions
+
+
+def excluded_columns(mtx, case_no):
+    rng = np.random.default_rng(case_no)
+    return [np.flatnonzero(rng.random(mtx.shape[1]) < 0.3) for _ in range(3)]
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+@pytest.mark.parametrize('case_no', range(len(CASES)))
+def test_search_batch(case_no, backend):
+    # Excluding columns in a batch matches solving every smaller matrix on its own
+    mtx, secondary = CASES[case_no]
+    instances = excluded_columns(mtx, case_no)
+
+    dl = solver(mtx, backend=backend, secondary=secondary)
+    batch = list(dl.search_batch(instances, multi_solution_flag=True))
+    firsts = list(dl.search_batch(instances))
+    counts = list(dl.search_batch(instances, count_only=True))
+    for excluded, solutions, first, count in zip(instances, batch, firsts, counts):
+        kept_rows = np.flatnonzero(~mtx[:, excluded].any(axis=1))
+        kept_cols = [col_ind for col_ind in range(mtx.shape[1]) if col_ind not in excluded]
+        kept_secondary = [new_ind for new_ind, col_ind in enumerate(kept_cols) if secondary is not None and col_ind in secondary]
+        expected = [frozenset(kept_rows[row_ind] for row_ind in solution) for solution in reference_solutions(mtx[kept_rows][:, kept_cols], kept_secondary)]
+        assert as_sets(solutions) == expected, excluded
+        assert first == (sorted(solutions[0]) if solutions else False)
+        assert count == len(solutions)
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+@pytest.mark.parametrize('case_no', range(len(CASES)))
+def test_search_batch_leaves_the_solver_as_it_was(case_no, backend):
+    mtx, secondary = CASES[case_no]
+    expected = list(solver(mtx, backend=backend, secondary=secondary).iter_solutions())
+
+    dl = solver(mtx, backend=backend, secondary=secondary)
+    list(dl.search_batch(excluded_columns(mtx, case_no), multi_solution_flag=True))
+    dl.search(multi_solution_flag=True)
+    assert dl.all_solutions == expected
+
+
+def fixed_batch(case_no, backend):
+    """
+    A fixed row of the case, batch instances that all exclude one of its columns, the solutions
+    before the batch, the batch results (all solutions, first solution, count) and the solutions after.
+    """
+    mtx, secondary = CASES[case_no]
+    live_rows = np.flatnonzero(mtx.any(axis=1))
+    row_ind = int(live_rows[case_no % len(live_rows)])
+    covered = set(np.flatnonzero(mtx[row_ind]).tolist())
+    rng = np.random.default_rng(case_no)
+    overlapping = [sorted({min(covered)} | set(np.flatnonzero(rng.random(mtx.shape[1]) < 0.3).tolist())) for _ in range(3)]
+
+    dl = solver(mtx, backend=backend, secondary=secondary)
+    dl.fix_row(row_ind)
+    before = list(dl.iter_solutions())
+    batches = (
+        list(dl.search_batch(overlapping, multi_solution_flag=True)),
+        list(dl.search_batch(overlapping)),
+        list(dl.search_batch(overlapping, count_only=True)),
+    )
+    return row_ind, overlapping, before, batches, list(dl.iter_solutions())
+
+
+FIXED_CASES = [case_no for case_no, (mtx, _) in enumerate(CASES) if mtx.any()]
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+@pytest.mark.parametrize('case_no', FIXED_CASES)
+def test_search_batch_after_fix_row(case_no, backend):
+    # A batch may exclude columns the fixed row covers, they stay covered by it
+    mtx, secondary = CASES[case_no]
+    row_ind, overlapping, before, batches, after = fixed_batch(case_no, backend)
+    covered = set(np.flatnonzero(mtx[row_ind]).tolist())
+
+    for excluded, solutions in zip(overlapping, batches[0]):
+        kept_cols = [col_ind for col_ind in range(mtx.shape[1]) if col_ind in covered or col_ind not in excluded]
+        # The rows left beside the fixed one, the columns it covers being optional
+        kept_rows = [kept_ind for kept_ind in range(len(mtx)) if not mtx[kept_ind, excluded].any() and not mtx[kept_ind, sorted(covered)].any()]
+        optional = [new_ind for new_ind, col_ind in enumerate(kept_cols) if col_ind in covered or (secondary is not None and col_ind in secondary)]
+        expected = [frozenset(kept_rows[kept_ind] for kept_ind in solution) | {row_ind} for solution in reference_solutions(mtx[kept_rows][:, kept_cols], optional)]
+        assert as_sets(solutions) == sorted(expected, key=sorted), excluded
+    assert after == before
+
+
+@pytest.mark.parametrize('case_no', FIXED_CASES)
+def test_search_batch_after_fix_row_backends_agree(case_no):
+    results = [fixed_batch(case_no, backend)[3] for backend in BACKENDS]
+    assert all(batches == results[0] for batches in results)
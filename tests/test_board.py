@@ -0,0 +1,34 @@
+import pytest
+
+from exact_cover import storage
+from exact_cover.board import Board
+
+
+# A few pieces on a small coloured board
+BOARD = Board(['BWBW', 'WBWB', '.WBW'])
+ORIENTATION_SETS = [[[['B', 'W']]], [[['W'], ['B']]], [[['B', 'W', 'B'], ['W', 0, 0]]], [[[1, 1]], [[1], [1]]]]
+HOLE_SETS = [(hole1, hole2) for hole1 in range(1, 12) for hole2 in range(hole1 + 1, 12)]
+
+
+@pytest.fixture(scope='module')
+def main_dict():
+    return BOARD.create_main_dict(ORIENTATION_SETS, HOLE_SETS)
+
+
+def test_create_main_dict(main_dict):
+    assert main_dict[(1, 2)] == {
+        0: [[3, 4], [6, 7], [10, 11]], 1: [[4, 8], [7, 10]], 2: [[6, 7, 8, 9]],
+        3: [[3, 4], [3, 7], [4, 8], [5, 6], [6, 7], [6, 9], [7, 8], [7, 10], [8, 11], [9, 10], [10, 11]],
+    }
+
+
+def test_placement_table(main_dict):
+    table = BOARD.placement_table(ORIENTATION_SETS, HOLE_SETS)
+    assert len(table) == len(HOLE_SETS)
+    assert all(dict(table[holes]) == main_dict[holes] for holes in table)
+
+
+def test_write_main_dict(tmp_path, main_dict):
+    path = str(tmp_path / 'main_dict.ecm')
+    BOARD.write_main_dict(path, ORIENTATION_SETS, HOLE_SETS)
+    assert storage.load_placements(path) == main_dict
@@ -0,0 +1,47 @@
+import pytest
+
+from exact_cover import BACKENDS, solver
+from cases import CASES
+
+
+def n_solutions(mtx, secondary, backend):
+    return len(list(solver(mtx, backend=backend, secondary=secondary).iter_solutions()))
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+@pytest.mark.parametrize('case_no', range(len(CASES)))
+def test_count_solutions(case_no, backend):
+    mtx, secondary = CASES[case_no]
+    expected = n_solutions(mtx, secondary, backend)
+
+    assert solver(mtx, backend=backend, secondary=secondary).count_solutions() == expected
+    for memo_size in [1, 2**10]:
+        assert solver(mtx, backend=backend, secondary=secondary).count_solutions(memo_size=memo_size) == expected, memo_size
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+@pytest.mark.parametrize('case_no', range(len(CASES)))
+def test_count_solutions_with_every_heuristic(case_no, backend):
+    mtx, secondary = CASES[case_no]
+    expected = n_solutions(mtx, secondary, backend)
+
+    for heuristic in BACKENDS[backend].HEURISTICS:
+        dl = solver(mtx, backend=backend, secondary=secondary, heuristic=heuristic)
+        assert dl.count_solutions(memo_size=2**10) == expected, heuristic
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+@pytest.mark.parametrize('case_no', range(len(CASES)))
+def test_count_up_to(case_no, backend):
+    mtx, secondary = CASES[case_no]
+    solutions = list(solver(mtx, backend=backend, secondary=secondary).iter_solutions())
+
+    dl = solver(mtx, backend=backend, secondary=secondary)
+    for k in range(4):
+        assert dl.count_up_to(k) == min(k, len(solutions)), k
+    assert dl.is_unique() == (len(solutions) == 1)
+
+    # With a clue, only the solutions containing it count
+    if solutions and solutions[0]:
+        clue = solutions[0][:1]
+        assert dl.count_up_to(3, pre_solution=clue) == min(3, sum(clue[0] in solution for solution in solutions))
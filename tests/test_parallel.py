@@ -0,0 +1,37 @@
+import itertools
+import multiprocessing
+import time
+import numpy as np
+import pytest
+
+from exact_cover import BACKENDS, solver
+from cases import CASES
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+@pytest.mark.parametrize('case_no', range(0, len(CASES), 20))
+def test_parallel_search_in_search_order(case_no, backend):
+    mtx, secondary = CASES[case_no]
+    dl = solver(mtx, backend=backend, secondary=secondary)
+    dl.search(multi_solution_flag=True)
+
+    parallel = solver(mtx, backend=backend, secondary=secondary)
+    parallel.parallel_search(workers=2)
+    assert parallel.all_solutions == dl.all_solutions
+    assert solver(mtx, backend=backend, secondary=secondary).parallel_search(workers=2, count_only=True) == len(dl.all_solutions)
+
+
+def test_first_solution_stops_the_other_workers():
+    # Row 0 solves everything at once, row 1 leaves 15 columns to pairs, which no search can cover
+    n_cols = 16
+    rows = [list(range(n_cols)), [0]] + [list(pair) for pair in itertools.combinations(range(1, n_cols), 2)]
+    mtx = np.zeros((len(rows), n_cols), dtype=int)
+    for row_ind, columns in enumerate(rows):
+        mtx[row_ind, columns] = 1
+
+    dl = solver(mtx)
+    start = time.perf_counter()
+    assert dl.parallel_search(workers=2, multi_solution_flag=False)
+    assert time.perf_counter() - start < 2
+    assert dl.get_rows() == [0]
+    assert not multiprocessing.active_children()  # The worker on row 1 was not left searching
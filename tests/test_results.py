@@ -0,0 +1,40 @@
+from exact_cover.results import SolutionIndex, SolutionWriter, canonical_hash
+
+
+def test_canonical_hash():
+    # The same tiling with other piece numbers and orders, and another tiling
+    solution = {0: [3, 1, 2], 4: [5, 4]}
+    assert canonical_hash(solution) == canonical_hash({7: [4, 5], 2: [1, 2, 3]})
+    assert canonical_hash(solution) != canonical_hash({0: [1, 2], 4: [3, 4, 5]})
+
+
+def test_index_across_runs(tmp_path):
+    index_path = str(tmp_path / 'index.npy')
+    solution = {0: [3, 1, 2], 4: [5, 4]}
+    with SolutionIndex(index_path) as index:
+        assert index.add(solution)
+        assert not index.add({1: [4, 5], 0: [2, 3, 1]})
+        assert index.add({0: [1, 2], 4: [3, 4, 5]})
+
+    index = SolutionIndex(index_path)
+    assert len(index) == 2
+    assert not index.add(solution)
+    assert index.add({0: [1], 4: [2, 3, 4, 5]})
+    index.save()
+    assert len(SolutionIndex(index_path)) == 3
+
+
+def test_index_add_file(tmp_path):
+    # Solutions a stopped run wrote past the last save are found again from the results file
+    index_path, results_path = str(tmp_path / 'index.npy'), str(tmp_path / 'results.jsonl')
+    with SolutionIndex(index_path) as index:
+        index.add({0: [1, 2], 4: [3, 4, 5]})
+
+    with SolutionWriter(results_path) as sink:
+        sink.write(1, {0: [1, 2], 4: [3, 4, 5]})
+        sink.write(2, {3: [6, 7]})
+
+    index = SolutionIndex(index_path)
+    assert index.add_file(results_path) == 1
+    assert len(index) == 2
+    assert not index.add({1: [7, 6]})
@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+from exact_cover import BACKENDS, solver
+from cases import CASES, as_sets, optional_columns, reference_solutions
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+@pytest.mark.parametrize('case_no', range(len(CASES)))
+def test_add_remove_fix_rows(case_no, backend):
+    # Adding, removing and fixing rows on the built solver matches solving the changed matrix
+    mtx, secondary = CASES[case_no]
+    rng = np.random.default_rng(case_no)
+
+    dl = solver(mtx, backend=backend, secondary=secondary)
+    live = {row_ind: np.flatnonzero(row).tolist() for row_ind, row in enumerate(mtx) if row.any()}
+    fixed = []
+    for _ in range(6):
+        operation = rng.integers(4)
+        if operation == 0:
+            columns = np.flatnonzero(rng.random(mtx.shape[1]) < 0.35).tolist()
+            row_ind = dl.add_row(columns)
+            if columns:
+                live[row_ind] = columns
+        elif operation == 1 and set(live) - set(fixed):
+            row_ind = int(rng.choice(sorted(set(live) - set(fixed))))
+            dl.remove_row(row_ind)
+            del live[row_ind]
+        elif operation == 2 and live:
+            row_ind = int(rng.choice(sorted(live)))
+            if dl.fix_row(row_ind):
+                fixed.append(row_ind)
+        elif operation == 3 and fixed:
+            dl.unfix_row(fixed.pop(rng.integers(len(fixed))))
+
+        changed = np.zeros((max(live, default=-1) + 1, mtx.shape[1]), dtype=int)
+        for row_ind, columns in live.items():
+            changed[row_ind, columns] = 1
+        # The fixed rows and a solution of what they leave, where their columns count as covered
+        covered = set(col_ind for row_ind in fixed for col_ind in live[row_ind])
+        kept_rows = [row_ind for row_ind in range(len(changed)) if not covered & set(np.flatnonzero(changed[row_ind]).tolist())]
+        optional = covered | optional_columns(secondary)
+        expected = [frozenset(fixed) | {kept_rows[row_ind] for row_ind in solution} for solution in reference_solutions(changed[kept_rows], optional)]
+        assert as_sets(dl.iter_solutions()) == sorted(expected, key=sorted), dl.history
+
+    # undo() brings back the solver as it was built
+    while dl.history:
+        dl.undo()
+    assert list(dl.iter_solutions()) == list(solver(mtx, backend=backend, secondary=secondary).iter_solutions())
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+@pytest.mark.parametrize('case_no', [case_no for case_no, (mtx, _) in enumerate(CASES[:40]) if mtx.any()])
+def test_parallel_search_after_fix_row(case_no, backend):
+    # The first solution parallel_search finds contains the fixed row and covers the rest
+    mtx, secondary = CASES[case_no]
+    live_rows = np.flatnonzero(mtx.any(axis=1))
+    row_ind = int(live_rows[case_no % len(live_rows)])
+
+    dl = solver(mtx, backend=backend, secondary=secondary)
+    dl.fix_row(row_ind)
+    solutions = list(map(sorted, dl.iter_solutions()))
+    found = dl.parallel_search(workers=2, multi_solution_flag=False)
+    assert found == bool(solutions)
+    assert not found or sorted(dl.get_rows()) in solutions
+    assert list(map(sorted, dl.iter_solutions())) == solutions
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_add_row_after_empty_rows(backend):
+    # A new row is numbered after every row of the matrix, the empty ones at the bottom too
+    dl = solver(np.array([[1, 0], [0, 1], [0, 0], [0, 0]]), backend=backend)
+    assert dl.add_row([0, 1]) == 4
+    assert list(map(sorted, dl.iter_solutions())) == [[0, 1], [4]]
+    dl.undo()
+    assert dl.add_row([0, 1]) == 4
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from exact_cover import BACKENDS, solver
+from cases import SECONDARY_CASES, as_sets, optional_columns, reference_solutions
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+@pytest.mark.parametrize('case_no', range(len(SECONDARY_CASES)))
+def test_matches_reference(case_no, backend):
+    mtx, secondary = SECONDARY_CASES[case_no]
+    dl = solver(mtx, backend=backend, secondary=secondary)
+    dl.search(multi_solution_flag=True)
+    assert as_sets(dl.all_solutions) == reference_solutions(mtx, optional_columns(secondary))
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+@pytest.mark.parametrize('case_no', range(len(SECONDARY_CASES)))
+def test_secondary_columns_covered_at_most_once(case_no, backend):
+    mtx, secondary = SECONDARY_CASES[case_no]
+    primary = np.ones(mtx.shape[1], dtype=bool)
+    primary[secondary] = False
+
+    dl = solver(mtx, backend=backend, secondary=secondary)
+    dl.search(multi_solution_flag=True)
+    for solution in dl.all_solutions:
+        covered = mtx[solution].sum(axis=0)
+        assert (covered[primary] == 1).all() and (covered <= 1).all(), solution
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_rows_of_secondary_columns_are_optional(backend):
+    # Column 2 is secondary: row 2 covers it alongside row 1, or it stays uncovered
+    mtx = np.array([
+        [1, 1, 0],
+        [1, 0, 0],
+        [0, 1, 1],
+        [0, 0, 1],
+    ])
+    dl = solver(mtx, backend=backend, secondary=[2])
+    dl.search(multi_solution_flag=True)
+    assert as_sets(dl.all_solutions) == as_sets([[0], [1, 2]])
@@ -0,0 +1,31 @@
+import pytest
+
+from exact_cover import BACKENDS
+from exact_cover import storage
+from cases import MATRICES, reference_solutions
+
+
+@pytest.mark.parametrize('matrix_no', range(len(MATRICES)))
+def test_matrix_round_trip(tmp_path, matrix_no):
+    mtx = MATRICES[matrix_no]
+    path = str(tmp_path / 'test.ecm')
+    storage.save_matrix(path, mtx)
+    assert (storage.load(path).toarray() == mtx).all()
+
+    for backend, dlx_class in BACKENDS.items():
+        assert dlx_class.from_file(path).count_solutions() == len(reference_solutions(mtx)), backend
+
+
+def test_placements_round_trip(tmp_path):
+    path = str(tmp_path / 'test.ecm')
+    placements = {(1, 2): {0: [[1, 2], [3]], 1: []}, (4, 5): {0: [], 1: [[0, 7, 9]]}, (6, 7): {0: [], 1: []}}
+    storage.save_placements(path, placements)
+    assert storage.load_placements(path) == placements
+
+
+def test_load_some_placements(tmp_path):
+    path = str(tmp_path / 'test.ecm')
+    dates = {date: {piece_number: [[date, piece_number]] for piece_number in range(3)} for date in range(5)}
+    storage.save_placements(path, dates)
+    assert storage.load_placements(path) == dates
+    assert storage.load_placements(path, [3, 1]) == {3: dates[3], 1: dates[1]}
@@ -0,0 +1,47 @@
+import time
+import numpy as np
+
+from exact_cover import solver
+from exact_cover.sweep import Journal, read_journal, run_sweep
+
+
+def count_chunk(units):
+    # The solution count of the identity matrix of every size in units
+    return [solver(np.eye(size, dtype=int), backend='bitset').count_solutions() for size, _ in units]
+
+
+def slow_first_chunk(units):
+    # The unit 0 takes a while, the others none
+    if units[0] == 0:
+        time.sleep(1)
+    return list(units)
+
+
+UNITS = [(size, (size, 'identity')) for size in range(1, 20)]
+
+
+def test_sweep(tmp_path):
+    journal_path = str(tmp_path / 'journal.jsonl')
+    assert run_sweep(UNITS, count_chunk, journal_path, processes=2, chunk_size=3) == {unit: 1 for unit in UNITS}
+    assert len(read_journal(journal_path)) == len(UNITS)
+
+
+def test_stopped_sweep_resumes(tmp_path):
+    # A sweep stopped part of the way, with a line cut short, only solves the units left
+    journal_path = str(tmp_path / 'journal.jsonl')
+    with Journal(journal_path) as journal:
+        for unit in UNITS[:5]:
+            journal.record(unit, 2)  # Not what count_chunk returns, to tell them apart
+    with open(journal_path, 'a') as f:
+        f.write('{"unit":[6,[6,')
+
+    results = run_sweep(UNITS, count_chunk, journal_path, processes=2, chunk_size=3)
+    assert results == {unit: 2 if unit in UNITS[:5] else 1 for unit in UNITS}
+    assert len(read_journal(journal_path)) == len(UNITS)
+
+
+def test_slow_chunk_holds_back_no_other(tmp_path):
+    # The chunks done while the first one still runs are journalled first, the results still come in order
+    journal_path = str(tmp_path / 'journal.jsonl')
+    assert list(run_sweep(range(6), slow_first_chunk, journal_path, processes=2, chunk_size=1).items()) == [(unit, unit) for unit in range(6)]
+    assert list(read_journal(journal_path)) == [1, 2, 3, 4, 5, 0]
@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from exact_cover import BitsetExactCover
+from exact_cover.bitset import permutation_group
+from cases import reference_solutions
+
+
+def symmetric_matrix(test_no):
+    """
+    A random matrix closed under the rotations of its columns laid out on a cycle in random order
+    (and under reflections every other time), along with the generators of that group.
+    """
+    rng = np.random.default_rng(test_no)
+    n_cols = int(rng.integers(2, 9))
+    cycle = rng.permutation(n_cols)
+    rotation, reflection = np.empty(n_cols, dtype=int), np.empty(n_cols, dtype=int)
+    rotation[cycle] = np.roll(cycle, 1)
+    reflection[cycle] = cycle[::-1]
+    symmetries = [rotation] if test_no % 2 else [rotation, reflection]
+
+    mtx = (rng.random((int(rng.integers(1, 8)), n_cols)) < 0.35).astype(int)
+    mtx = np.unique(np.vstack([mtx] + [mtx[:, np.argsort(g)] for g in permutation_group(symmetries, n_cols)]), axis=0)
+    return mtx[mtx.any(axis=1)], symmetries
+
+
+SYMMETRIC_CASES = [case for case in map(symmetric_matrix, range(100)) if len(case[0])]
+
+
+def smallest_of_every_orbit(mtx, symmetries):
+    group = permutation_group(symmetries, mtx.shape[1])
+    row_of = {tuple(row): row_ind for row_ind, row in enumerate(mtx.tolist())}
+
+    def image(solution, g):
+        return sorted(row_of[tuple(mtx[row_ind, np.argsort(g)].tolist())] for row_ind in solution)
+
+    solutions = [sorted(solution) for solution in reference_solutions(mtx)]
+    return sorted(solution for solution in solutions if all(solution <= image(solution, g) for g in group))
+
+
+@pytest.mark.parametrize('case_no', range(len(SYMMETRIC_CASES)))
+def test_only_the_smallest_solution_of_every_orbit(case_no):
+    mtx, symmetries = SYMMETRIC_CASES[case_no]
+    expected = smallest_of_every_orbit(mtx, symmetries)
+
+    dl = BitsetExactCover(mtx, symmetries=symmetries)
+    dl.search(multi_solution_flag=True)
+    assert sorted(map(sorted, dl.all_solutions)) == expected
+    assert BitsetExactCover(mtx, symmetries=symmetries).count_solutions() == len(expected)
+
+
+@pytest.mark.parametrize('case_no', range(len(SYMMETRIC_CASES)))
+def test_split_with_symmetries(case_no):
+    mtx, symmetries = SYMMETRIC_CASES[case_no]
+    dl = BitsetExactCover(mtx, symmetries=symmetries)
+    dl.search(multi_solution_flag=True)
+
+    split = []
+    for prefix in BitsetExactCover(mtx, symmetries=symmetries).iter_solutions(max_depth=1):
+        split.extend(BitsetExactCover(mtx, symmetries=symmetries).iter_solutions(pre_solution=prefix))
+    assert split == dl.all_solutions
+
+
+def test_symmetry_must_map_the_matrix_onto_itself():
+    with pytest.raises(ValueError):
+        BitsetExactCover(np.array([[1, 0], [1, 1]]), symmetries=[[1, 0]])